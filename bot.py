@@ -3,8 +3,22 @@ import discord
 import logging
 from discord.ext import commands
 from config import settings
-from db import init_db
+from db import init_db, apply_sql, warm_pool
 from redis_client import init_redis
+from utils.http import ImageFetcher
+from utils.render import RenderPool
+from utils.image_cache import ImageCache
+from utils.catalog import CardCatalog
+from utils.cooldowns import CooldownStore
+from utils.reminders import ReminderScheduler
+from utils.inventory_cache import InventoryCache
+from utils.team_cache import TeamCache
+from utils.leaderboard import Leaderboard
+from utils.write_behind import WriteBehind
+from utils.daily_claims import DailyClaims
+from utils.quests import QuestEngine
+from utils.matchmaking import Matchmaker
+from utils.identity import IdentityCache
 
 # --- Logging setup ---
 logging.basicConfig(
@@ -25,7 +39,60 @@ class MyBot(commands.Bot):
 
     async def setup_hook(self):
         self.db = await init_db()
+        await apply_sql(self.db)
+        await warm_pool(self.db, settings.DB_POOL_WARM_SIZE)
         self.redis = await init_redis()
+        self.identity = IdentityCache(
+            self.db,
+            redis=self.redis,
+            size=settings.IDENTITY_CACHE_SIZE,
+            ttl=settings.IDENTITY_CACHE_TTL_SEC,
+            negative_ttl=settings.IDENTITY_NEGATIVE_TTL_SEC,
+            shared_tier=settings.IDENTITY_REDIS_TIER
+        ).start()
+        self.cooldowns = CooldownStore(self.redis)
+        self.daily_claims = DailyClaims(self.redis, retention_days=settings.DAILY_CLAIM_RETENTION_DAYS)
+        self.inventory_cache = InventoryCache(self.redis, ttl=settings.INVENTORY_SNAPSHOT_TTL_SEC)
+        self.team_cache = TeamCache(self.redis, ttl=settings.TEAM_CACHE_TTL_SEC)
+        self.leaderboard = Leaderboard(self.redis).start(self.db)
+        self.write_behind = WriteBehind(
+            self.db, self.redis, interval=settings.WRITE_BEHIND_FLUSH_SEC,
+            team_cache=self.team_cache, inventory_cache=self.inventory_cache
+        ).start()
+        self.quests = await QuestEngine(self.db, self.write_behind).load()
+        self.reminders = ReminderScheduler(
+            self,
+            redis=self.redis if settings.REMINDER_BACKEND == "redis" else None,
+            tick=settings.REMINDER_TICK_SEC,
+            batch=settings.REMINDER_BATCH
+        ).start()
+        self.matchmaker = Matchmaker(
+            self,
+            redis=self.redis if settings.MATCH_BACKEND == "redis" else None,
+            base_window=settings.MATCH_BASE_WINDOW,
+            widen_per_sec=settings.MATCH_WIDEN_PER_SEC,
+            max_window=settings.MATCH_MAX_WINDOW,
+            tick=settings.MATCH_TICK_SEC,
+            timeout=settings.MATCH_TIMEOUT_SEC
+        ).start()
+        self.catalog = (await CardCatalog(self.db).load()).start(settings.CATALOG_REFRESH_SEC)
+        self.images = await ImageFetcher(
+            timeout=settings.IMAGE_FETCH_TIMEOUT_SEC,
+            per_host=settings.IMAGE_FETCH_PER_HOST,
+            breaker_threshold=settings.IMAGE_BREAKER_THRESHOLD,
+            breaker_reset=settings.IMAGE_BREAKER_RESET_SEC
+        ).start()
+        self.image_cache = await ImageCache(
+            self.images,
+            root=settings.IMAGE_CACHE_DIR,
+            max_bytes=settings.IMAGE_CACHE_MAX_BYTES,
+            revalidate_after=settings.IMAGE_CACHE_REVALIDATE_SEC
+        ).load()
+        self.renderer = RenderPool(
+            workers=settings.RENDER_WORKERS,
+            max_pending=settings.RENDER_MAX_PENDING,
+            timeout=settings.RENDER_TIMEOUT_SEC
+        ).start()
 
         extensions = [
             "cogs.register",
@@ -37,7 +104,9 @@ class MyBot(commands.Bot):
             "cogs.wlogs",
             "cogs.gacha",
             "cogs.devlog",
-            "cogs.team"
+            "cogs.team",
+            "cogs.leaderboard",
+            "cogs.battle"
         ]
 
         for ext in extensions:
@@ -54,6 +123,27 @@ class MyBot(commands.Bot):
         except Exception as e:
             logging.error(f"❌ Error syncing commands: {e}")
 
+    async def close(self):
+        if getattr(self, "reminders", None):
+            self.reminders.stop()
+        if getattr(self, "catalog", None):
+            self.catalog.stop()
+        if getattr(self, "matchmaker", None):
+            self.matchmaker.stop()
+        if getattr(self, "identity", None):
+            self.identity.stop()
+        if getattr(self, "leaderboard", None):
+            self.leaderboard.stop()
+        if getattr(self, "write_behind", None):
+            await self.write_behind.stop()
+        if getattr(self, "image_cache", None):
+            await self.image_cache.save()
+        if getattr(self, "images", None):
+            await self.images.close()
+        if getattr(self, "renderer", None):
+            self.renderer.close()
+        await super().close()
+
     async def on_ready(self):
         logging.info(f"✅ Logged in as {self.user} (ID: {self.user.id})")
         logging.info("📜 Available prefix commands:")
@@ -20,11 +20,15 @@ class Admin(commands.Cog):
     async def add_bloodcoins(self, ctx, member: discord.Member, amount: int):
         discord_id = str(member.id)
         async with self.bot.db.acquire() as conn:
-            await conn.execute("""
+            player = await conn.fetchrow("""
                 UPDATE players
                 SET bloodcoins = bloodcoins + $1
                 WHERE discord_id = $2
+                RETURNING id, bloodcoins
             """, amount, discord_id)
+        await self.bot.inventory_cache.invalidate(discord_id)
+        if player:
+            await self.bot.leaderboard.update(player["id"], coins=player["bloodcoins"])
         await ctx.send(f"✅ Added {amount} BloodCoins to {member.display_name}.")
 
     @commands.command(name="addnoble")
@@ -99,6 +103,86 @@ class Admin(commands.Cog):
             return
         await profile_cog.profile(ctx, member=member)
 
+    # --- Card catalog ---
+    @commands.command(name="reloadcards")
+    @admin_only()
+    async def reload_cards(self, ctx):
+        """Reload the in-memory card catalog after cards were added or approved."""
+        await self.bot.catalog.load()
+        await ctx.send(f"✅ Card catalog reloaded: {len(self.bot.catalog)} card(s).")
+
+    # --- Quests ---
+    @commands.command(name="reloadquests")
+    @admin_only()
+    async def reload_quests(self, ctx):
+        """Reload the event -> quest template index after templates changed."""
+        await self.bot.quests.load()
+        indexed = sum(len(ids) for ids in self.bot.quests.by_event.values())
+        await ctx.send(f"✅ Quest index reloaded: {indexed} template(s) over {len(self.bot.quests.by_event)} event(s).")
+
+    # --- Collection counters ---
+    @commands.command(name="rebuildstats")
+    @admin_only()
+    async def rebuild_stats(self, ctx):
+        """Recount player_collection_stats from user_cards (drift recovery)."""
+        async with self.bot.db.acquire() as conn:
+            await conn.execute("SELECT rebuild_collection_stats()")
+        await ctx.send("✅ Collection counters rebuilt.")
+
+    # --- Team power ---
+    @commands.command(name="rebuildpower")
+    @admin_only()
+    async def rebuild_power(self, ctx):
+        """Recompute team_power for every team (drift recovery)."""
+        async with self.bot.db.acquire() as conn:
+            await conn.execute("SELECT rebuild_team_power()")
+            teams = await conn.fetchval("SELECT COUNT(*) FROM team_power")
+        await ctx.send(f"✅ Team power rebuilt for {teams} team(s).")
+
+    # --- Leaderboards ---
+    @commands.command(name="rebuildtop")
+    @admin_only()
+    async def rebuild_top(self, ctx):
+        """Rebuild the Redis leaderboards from Postgres (drift recovery)."""
+        players = await self.bot.leaderboard.rebuild(self.bot.db)
+        await ctx.send(f"✅ Leaderboards rebuilt for {players} player(s).")
+
+    # --- Daily activity ---
+    @commands.command(name="dailystats")
+    @admin_only()
+    async def daily_stats(self, ctx, days: int = 7):
+        """Daily claims per UTC day, unique claimers and full streaks over the last `days` days."""
+        days = max(1, min(days, self.bot.daily_claims.retention_days))
+        claims = self.bot.daily_claims
+        per_day = await claims.active_counts(days)
+        unique = await claims.unique_active(days)
+        streaks = await claims.streak_count(days)
+
+        lines = [f"`{day:%a %d %b}` — **{count:,}**" for day, count in per_day]
+        embed = discord.Embed(
+            title=f"📊 Daily claims — last {days} day(s)",
+            description="\n".join(lines),
+            color=discord.Color.blurple()
+        )
+        embed.add_field(name="Unique players", value=f"{unique:,}", inline=True)
+        embed.add_field(name=f"Claimed all {days} day(s)", value=f"{streaks:,}", inline=True)
+        await ctx.send(embed=embed)
+
+    # --- Image cache warm-up ---
+    @commands.command(name="warmcache")
+    @admin_only()
+    async def warm_cache(self, ctx):
+        """Prefetch the image of every approved card into the local image cache."""
+        async with self.bot.db.acquire() as conn:
+            rows = await conn.fetch("SELECT id, image_url FROM cards WHERE approved = TRUE")
+
+        msg = await ctx.send(f"⏳ Warming image cache for {len(rows)} card(s)…")
+        fetched, cached, failed = await self.bot.image_cache.warm([(r["id"], r["image_url"]) for r in rows])
+        await msg.edit(content=(
+            f"✅ Image cache warmed: {fetched} fetched, {cached} already cached, {failed} failed "
+            f"({self.bot.image_cache.total_bytes / 1024 / 1024:.1f} MB on disk)."
+        ))
+
     # --- Give a specific card ---
     @commands.command(name="givecard")
     @admin_only()
@@ -129,6 +213,8 @@ class Admin(commands.Cog):
             session.add(UserCard(discord_id=str(member.id), card_id=card.id))
             await session.commit()
 
+        await self.bot.inventory_cache.invalidate(str(member.id))
+
         await ctx.send(f"✅ Gave **{card.character_name}** ({form}) to {member.display_name}.")
 
 async def setup(bot):
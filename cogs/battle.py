@@ -0,0 +1,87 @@
+import discord
+from discord.ext import commands
+from utils.battle import DRAW, simulate_one
+import queries
+
+LOG_LINES = 8
+
+def format_turn(turn, rosters) -> str:
+    attacker = rosters[turn.side][turn.slot]["character_name"]
+    target = rosters[1 - turn.side][turn.target_slot]["character_name"]
+    ko = " 💀" if turn.target_health == 0 else ""
+    return f"`R{turn.round}` {attacker} ➜ {target} **-{turn.damage}** ({turn.target_health} ❤️){ko}"
+
+class Battle(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        bot.matchmaker.on_match(self.resolve_match)
+        bot.matchmaker.on_timeout(self.queue_timeout)
+
+    async def _send(self, channel_id: int, **kwargs):
+        channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+        await channel.send(**kwargs)
+
+    async def resolve_match(self, a_id: int, a_meta: dict, b_id: int, b_meta: dict):
+        rosters = (
+            await self.bot.team_cache.roster(self.bot.db, a_id),
+            await self.bot.team_cache.roster(self.bot.db, b_id),
+        )
+        mentions = (f"<@{a_meta['discord_id']}>", f"<@{b_meta['discord_id']}>")
+        channels = {a_meta["channel_id"], b_meta["channel_id"]}
+
+        if not rosters[0] or not rosters[1]:
+            for channel_id in channels:
+                await self._send(channel_id, content=f"⚠️ Match {mentions[0]} vs {mentions[1]} cancelled: a team is empty.")
+            return
+
+        winner, rounds, turns = simulate_one(rosters[0], rosters[1], log=True)
+        if winner == DRAW:
+            result = "🤝 It's a draw!"
+        else:
+            result = f"🏆 {mentions[winner]} wins in {rounds} round(s)!"
+
+        embed = discord.Embed(
+            title="⚔️ Battle",
+            description=f"{mentions[0]} (power {a_meta.get('rating', '?')}) vs "
+                        f"{mentions[1]} (power {b_meta.get('rating', '?')})\n\n{result}",
+            color=discord.Color.red()
+        )
+        lines = [format_turn(t, rosters) for t in turns[-LOG_LINES:]]
+        if len(turns) > LOG_LINES:
+            lines.insert(0, f"*… {len(turns) - LOG_LINES} earlier hit(s)*")
+        embed.add_field(name="📜 Final turns", value="\n".join(lines) or "—", inline=False)
+
+        for channel_id in channels:
+            await self._send(channel_id, embed=embed)
+
+    async def queue_timeout(self, player_id: int, meta: dict):
+        await self._send(meta["channel_id"], content=f"⌛ <@{meta['discord_id']}> no opponent found, you left the battle queue.")
+
+    @commands.command(name="battle", aliases=["pvp"])
+    async def battle(self, ctx, action: str = None):
+        discord_id = str(ctx.author.id)
+        player_id = await self.bot.identity.player_id(discord_id)
+        if not player_id:
+            return await ctx.send("⚠️ You don't have a profile yet. Use `wregister`.")
+
+        async with self.bot.db.acquire() as conn:
+            power = await queries.fetchval(conn, "team.power", player_id)
+
+        if action and action.lower() in ("leave", "cancel", "stop"):
+            if await self.bot.matchmaker.leave(player_id):
+                return await ctx.send("👋 You left the battle queue.")
+            return await ctx.send("ℹ️ You are not in the battle queue.")
+
+        if power is None:
+            return await ctx.send("ℹ️ Your team is empty. Use `teamset` to define it.")
+
+        meta = {"channel_id": ctx.channel.id, "discord_id": discord_id}
+        match = await self.bot.matchmaker.join(player_id, power, meta)
+        if not match:
+            return await ctx.send(f"🔎 Searching for an opponent (team power **{power}**)… Use `wbattle leave` to cancel.")
+
+        opponent_id, opponent_meta = match
+        await self.resolve_match(player_id, {**meta, "rating": power}, opponent_id, opponent_meta or {})
+
+async def setup(bot):
+    await bot.add_cog(Battle(bot))
@@ -5,6 +5,7 @@ from models.user_card import UserCard
 from sqlalchemy.future import select
 from sqlalchemy import update
 from sqlalchemy.orm import selectinload
+from utils.progression import card_level
 
 FORM_COLORS = {
     "base": discord.Color.blue(),
@@ -46,7 +47,7 @@ class Buddy(commands.Cog):
                     return
 
                 card, uc = row
-                level = uc.xp // 100 + 1
+                level = card_level(uc.xp)
                 embed = discord.Embed(
                     title=f"🤝 Buddy of {ctx.author.display_name}: {card.character_name}",
                     description=card.description or "No description available.",
@@ -90,7 +91,7 @@ class Buddy(commands.Cog):
                 .values(buddy_card_id=card.id)
             )
 
-            level = uc.xp // 100 + 1
+            level = card_level(uc.xp)
             embed = discord.Embed(
                 title=f"✅ Buddy set: {card.character_name} ({form})",
                 description=card.description or "No description available.",
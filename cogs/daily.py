@@ -1,86 +1,76 @@
 import discord
 from discord.ext import commands
 import datetime
-from utils.leveling import add_xp
+import queries
+from utils.progression import apply_xp
 from utils.db import db_transaction  # helper context manager
 
-# --- Helper: resolve internal player ID from discord_id ---
-async def get_user_id(conn, discord_id: str) -> int:
-    return await conn.fetchval("SELECT id FROM players WHERE discord_id = $1", discord_id)
-
-# --- Helper: update quest progress ---
-async def update_quest_progress(conn, user_id: int, quest_desc: str, amount: int = 1):
-    await conn.execute("""
-        UPDATE user_quests
-        SET progress = progress + $1,
-            completed = (progress + $1) >= qt.target
-        FROM quest_templates qt
-        WHERE user_quests.quest_id = qt.quest_id
-          AND user_quests.user_id = $2
-          AND qt.description = $3
-          AND user_quests.claimed = FALSE
-    """, amount, user_id, quest_desc)
-
-# --- Helper: gain buddy XP ---
-async def gain_buddy_xp(bot, discord_id: str, amount: int):
-    async with db_transaction(bot.db) as conn:
-        buddy_id = await conn.fetchval("SELECT buddy_card_id FROM players WHERE discord_id = $1", discord_id)
-        if not buddy_id:
-            return
-
-        await conn.execute("""
-            UPDATE user_cards
-            SET xp = xp + $1,
-                health = 100 + ((xp + $1) / 100)::int * 5,
-                attack = 10 + ((xp + $1) / 100)::int * 2,
-                speed = 10 + ((xp + $1) / 100)::int * 1
-            WHERE discord_id = $2 AND card_id = $3
-        """, amount, discord_id, buddy_id)
+DAILY_BLOODCOINS = 10000
+DAILY_XP = 10
+DAILY_BUDDY_XP = 5
 
 class Daily(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.cooldowns = {}
 
     @commands.command(name="daily", aliases=["d"])
     async def daily(self, ctx):
         discord_id = str(ctx.author.id)
         now = datetime.datetime.utcnow()
+        tomorrow_midnight = datetime.datetime.combine(now.date(), datetime.time.min) + datetime.timedelta(days=1)
 
-        today_midnight = datetime.datetime.combine(now.date(), datetime.time.min)
-        tomorrow_midnight = today_midnight + datetime.timedelta(days=1)
+        player_id = await self.bot.identity.player_id(discord_id)
+        if not player_id:
+            await ctx.send("⚠️ You don't have a profile yet. Use `wregister`.")
+            return
 
-        last_claim = self.cooldowns.get(discord_id)
-        if last_claim and last_claim >= today_midnight:
+        if not await self.bot.daily_claims.claim(player_id, now.date()):
             remaining = (tomorrow_midnight - now).total_seconds()
             hours = int(remaining // 3600)
             minutes = int((remaining % 3600) // 60)
             await ctx.send(
                 f"⏳ You already claimed your daily. Next reset in {hours}h {minutes}m "
-                f"(<t:{int(tomorrow_midnight.timestamp())}:R>)."
+                f"(<t:{int(tomorrow_midnight.replace(tzinfo=datetime.timezone.utc).timestamp())}:R>)."
             )
             return
 
-        async with db_transaction(self.bot.db) as conn:
-            await conn.execute("""
-                UPDATE players SET bloodcoins = bloodcoins + 10000 WHERE discord_id = $1
-            """, discord_id)
-
-            user_id = await get_user_id(conn, discord_id)
-            await update_quest_progress(conn, user_id, "Do !daily", 1)
-            await update_quest_progress(conn, user_id, "Do 5 !daily", 1)
-
-        self.cooldowns[discord_id] = now
-
-        await gain_buddy_xp(self.bot, discord_id, amount=5)
-        leveled_up, new_level = await add_xp(self.bot, discord_id, 10)
+        try:
+            async with db_transaction(self.bot.db) as conn:
+                player = await queries.fetchrow(conn, "daily.reward", player_id, DAILY_BLOODCOINS)
+        except Exception:
+            # the reward was rolled back, so don't burn the player's daily
+            await self.bot.daily_claims.unclaim(player_id, now.date())
+            raise
+
+        await self.bot.inventory_cache.invalidate(discord_id)
+        leveled_up, new_level = False, None
+        if player:
+            # XP and buddy XP are flushed to Postgres in batches
+            wb = self.bot.write_behind
+            await wb.add_player(player["id"], xp=DAILY_XP)
+            if player["buddy_card_id"]:
+                await wb.add_buddy_xp(player["id"], player["buddy_card_id"], DAILY_BUDDY_XP)
+            _, pending_xp = await wb.pending_player(player["id"])
+            before, _, _ = apply_xp(player["level"], player["xp"], pending_xp - DAILY_XP)
+            new_level, new_xp, _ = apply_xp(player["level"], player["xp"], pending_xp)
+            leveled_up = new_level > before
+            await self.bot.quests.report_many([
+                (player["id"], "daily", 1),
+                (player["id"], "level_up", new_level - before),
+            ])
+            await self.bot.leaderboard.update(
+                player["id"], coins=player["bloodcoins"], level=(new_level, new_xp)
+            )
 
         embed = discord.Embed(
             title="🎁 Daily Reward",
-            description=f"✅ {ctx.author.display_name}, you received **10,000 Bloodcoins**!",
+            description=f"✅ {ctx.author.display_name}, you received **{DAILY_BLOODCOINS:,} Bloodcoins**!",
             color=discord.Color.gold()
         )
         embed.set_thumbnail(url=ctx.author.display_avatar.url)
+        streak = await self.bot.daily_claims.streak(player_id)
+        if streak > 1:
+            embed.add_field(name="🔥 Streak", value=f"{streak} days in a row", inline=True)
 
         if leveled_up:
             embed.add_field(name="📈 Level Up", value=f"You reached **Level {new_level}**!", inline=False)
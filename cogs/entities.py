@@ -1,4 +1,5 @@
 import discord
+from utils.progression import card_level
 
 # --- Base stats by form (fallback if nothing in DB) ---
 FORM_BASE_STATS = {
@@ -20,6 +21,8 @@ FORM_COLORS = {
 }
 
 class Stats:
+    __slots__ = ("health", "attack", "speed")
+
     def __init__(self, health: int, attack: int, speed: int):
         self.health = health
         self.attack = attack
@@ -29,6 +32,8 @@ class Stats:
         return f"❤️ {self.health} | 🗡️ {self.attack} | 💨 {self.speed}"
 
 class Entity:
+    __slots__ = ("name", "form", "stats", "image_url", "series", "quantity", "xp", "level")
+
     def __init__(self, name: str, form: str = "base",
                  image_url: str = None, series: str = None,
                  override_stats: dict = None, quantity: int = 1, xp: int = 0):
@@ -43,7 +48,7 @@ class Entity:
         self.series = series or "Unknown"
         self.quantity = quantity
         self.xp = xp
-        self.level = self.xp // 100 + 1
+        self.level = card_level(self.xp)
 
     def is_alive(self) -> bool:
         return self.stats.health > 0
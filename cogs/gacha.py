@@ -1,13 +1,8 @@
 import discord
 from discord.ext import commands
 from utils.db import db_transaction
-import random
-
-PULL_RATES = {
-    "base": 0.90,
-    "awakened": 0.095,
-    "event": 0.005
-}
+from utils.gacha_rolls import EVENT_PITY, roll_pulls
+import queries
 
 FORM_ANIMATIONS = {
     "base": "https://your.cdn.com/animations/base.gif",
@@ -38,52 +33,34 @@ class WarpLakeView(discord.ui.View):
         discord_id = str(self.author.id)
 
         async with db_transaction(interaction.client.db) as conn:
-            player = await conn.fetchrow("SELECT id, gate_keys, pulls FROM players WHERE discord_id = $1", discord_id)
-            if not player:
-                await interaction.response.send_message("⚠️ You don't have a profile.", ephemeral=True)
-                return
+            # Deduct keys and advance the pity counter in one statement; returns the pre-update counter
+            player = await queries.fetchrow(conn, "gacha.spend_keys", count, discord_id, EVENT_PITY)
 
-            if player["gate_keys"] < count:
-                await interaction.response.send_message("🔒 Not enough Gate Keys.", ephemeral=True)
+            if not player:
+                exists = await queries.fetchval(conn, "players.exists", discord_id)
+                if not exists:
+                    await interaction.response.send_message("⚠️ You don't have a profile.", ephemeral=True)
+                else:
+                    await interaction.response.send_message("🔒 Not enough Gate Keys.", ephemeral=True)
                 return
 
-            pulls = []
-            guaranteed_awakened = False
-            guaranteed_event = player["pulls"] + count >= 50
-
-            for i in range(count):
-                form = self.roll_form(guaranteed_event if i == count - 1 else False)
-                if form == "awakened":
-                    guaranteed_awakened = True
-                pulls.append(form)
-
-            if count == 10 and not guaranteed_awakened:
-                pulls[random.randint(0, 9)] = "awakened"
-
-            await conn.execute("""
-                UPDATE players SET gate_keys = gate_keys - $1, pulls = CASE WHEN pulls + $1 >= 50 THEN 0 ELSE pulls + $1 END
-                WHERE discord_id = $2
-            """, count, discord_id)
+            pulls = roll_pulls(count, player["pulls_before"])
 
             cards = []
             for form in pulls:
-                card = await conn.fetchrow("""
-                    SELECT id, character_name, image_url, description
-                    FROM cards
-                    WHERE form = $1
-                    ORDER BY random()
-                    LIMIT 1
-                """, form)
-
+                card = interaction.client.catalog.pick(form)
                 if card:
-                    await conn.execute("""
-                        INSERT INTO user_cards (user_id, card_id, quantity)
-                        VALUES ($1, $2, 1)
-                        ON CONFLICT (user_id, card_id)
-                        DO UPDATE SET quantity = user_cards.quantity + 1
-                    """, player["id"], card["id"])
                     cards.append((form, card))
 
+            # One upsert for the whole multi-summon; duplicates are folded into a single quantity
+            upserted = await queries.fetch(conn, "gacha.add_cards", player["id"], [card["id"] for _, card in cards])
+
+        await interaction.client.leaderboard.incr("collection", player["id"], sum(r["inserted"] for r in upserted))
+
+        await interaction.client.inventory_cache.invalidate(discord_id)
+        await interaction.client.team_cache.invalidate(player["id"])
+        await interaction.client.quests.report(player["id"], "summon", count)
+
         embed = discord.Embed(
             title=f"🌊 Warp Lake Summon",
             description=f"✨ {self.author.display_name} used {count} Gate Key{'s' if count > 1 else ''}!",
@@ -101,16 +78,6 @@ class WarpLakeView(discord.ui.View):
         embed.set_image(url=FORM_ANIMATIONS.get(cards[-1][0], ""))  # Animation for last pull
         await interaction.response.edit_message(embed=embed, view=self)
 
-    def roll_form(self, force_event=False) -> str:
-        if force_event:
-            return "event"
-        roll = random.random()
-        if roll < PULL_RATES["event"]:
-            return "event"
-        elif roll < PULL_RATES["event"] + PULL_RATES["awakened"]:
-            return "awakened"
-        return "base"
-
 class WarpLake(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
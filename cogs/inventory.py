@@ -3,6 +3,9 @@ from discord.ext import commands
 from typing import Optional, List, Dict
 from .entities import entity_from_db
 from utils.db import db_transaction
+from config import settings
+import queries
+from utils.progression import card_level, card_levels
 
 FORM_EMOJIS = {
     "base": "🟦",
@@ -22,9 +25,6 @@ def format_stats(entity) -> str:
         f"💨 `{entity.stats.speed}`"
     )
 
-def get_level(xp: int) -> int:
-    return xp // 100 + 1
-
 class FormSelect(discord.ui.Select):
     def __init__(self, parent_view: "InventoryView"):
         options = [
@@ -42,6 +42,7 @@ class FormSelect(discord.ui.Select):
             return
         self.parent_view.current_form = self.values[0]
         self.parent_view.page = 0
+        await self.parent_view.reload()
         self.parent_view.update_card_select()
         await interaction.response.edit_message(embed=self.parent_view.format_page(), view=self.parent_view)
 
@@ -61,6 +62,7 @@ class SortSelect(discord.ui.Select):
             return
         self.parent_view.sort_mode = self.values[0]
         self.parent_view.page = 0
+        await self.parent_view.reload()
         self.parent_view.update_card_select()
         await interaction.response.edit_message(embed=self.parent_view.format_page(), view=self.parent_view)
 
@@ -78,6 +80,13 @@ class InventoryView(discord.ui.View):
         self.card_select: Optional[discord.ui.Select] = None
         self.filter_mode = False
 
+        # Built once per view: card_id -> row, and lazily memoized sorted index arrays
+        self.by_id: Dict[int, Dict] = {c["card_id"]: c for c in cards}
+        self.form_counts: Dict[str, int] = {}
+        for c in cards:
+            self.form_counts[c["form"]] = self.form_counts.get(c["form"], 0) + 1
+        self._indexes: Dict[tuple, List[int]] = {}
+
         self.setup_main_view()
 
     def setup_main_view(self):
@@ -122,20 +131,67 @@ class InventoryView(discord.ui.View):
         self.setup_main_view()
         await interaction.response.edit_message(embed=self.format_page(), view=self)
 
-    def get_filtered_cards(self) -> List[Dict]:
-        filtered = [c for c in self.cards if self.current_form == "all" or c["form"] == self.current_form]
-        if self.sort_mode == "level":
-            return sorted(filtered, key=lambda c: get_level(c.get("xp", 0)), reverse=True)
-        elif self.sort_mode == "quantity":
-            return sorted(filtered, key=lambda c: c["quantity"], reverse=True)
-        return sorted(filtered, key=lambda c: c["character_name"])
+    def get_index(self, form: str, sort_mode: str) -> List[int]:
+        """
+        Positions in self.cards for this (form, sort_mode), computed once.
+        The sorts are stable, so filtering the sorted "all" index gives the same
+        order as sorting the filtered list: only one sort per sort_mode.
+        """
+        key = (form, sort_mode)
+        index = self._indexes.get(key)
+        if index is not None:
+            return index
+
+        if form != "all":
+            index = [i for i in self.get_index("all", sort_mode) if self.cards[i]["form"] == form]
+        else:
+            cards = self.cards
+            if sort_mode == "level":
+                levels = card_levels([c.get("xp") or 0 for c in cards]).tolist()
+                index = sorted(range(len(cards)), key=levels.__getitem__, reverse=True)
+            elif sort_mode == "quantity":
+                index = sorted(range(len(cards)), key=lambda i: cards[i]["quantity"], reverse=True)
+            else:
+                index = sorted(range(len(cards)), key=lambda i: cards[i]["character_name"])
+
+        self._indexes[key] = index
+        return index
+
+    # --- Data access (overridden by PagedInventoryView) ---
+    async def reload(self):
+        """Called after the filter or sort changed."""
+
+    def page_cards(self) -> List[Dict]:
+        index = self.get_index(self.current_form, self.sort_mode)
+        start, end = self.page * self.per_page, (self.page + 1) * self.per_page
+        return [self.cards[i] for i in index[start:end]]
+
+    def page_count(self) -> int:
+        return max(1, (len(self.get_index(self.current_form, self.sort_mode)) - 1) // self.per_page + 1)
+
+    def header_totals(self) -> tuple[int, int, int]:
+        total = len(self.get_index(self.current_form, self.sort_mode))
+        if self.current_form == "all":
+            return total, self.form_counts.get("awakened", 0), self.form_counts.get("event", 0)
+        return (
+            total,
+            total if self.current_form == "awakened" else 0,
+            total if self.current_form == "event" else 0
+        )
+
+    def find_card(self, card_id: int) -> Optional[Dict]:
+        return self.by_id.get(card_id)
+
+    async def go_to_page(self, page: int) -> bool:
+        if 0 <= page < self.page_count():
+            self.page = page
+            return True
+        return False
 
     def update_card_select(self):
         if self.card_select:
             self.remove_item(self.card_select)
-        filtered = self.get_filtered_cards()
-        start, end = self.page * self.per_page, (self.page + 1) * self.per_page
-        chunk = filtered[start:end]
+        chunk = self.page_cards()
         if not chunk:
             return
         options = []
@@ -145,7 +201,7 @@ class InventoryView(discord.ui.View):
                 "attack": c.get("u_attack"),
                 "speed": c.get("u_speed")
             })
-            level = get_level(c.get("xp", 0))
+            level = card_level(c.get("xp", 0))
             label = f"{c['character_name']} ({c['form'].capitalize()})"
             desc = f"Lvl {level} • Qty: {c['quantity']} • {format_stats(entity)}"
             options.append(discord.SelectOption(label=label, description=desc, value=str(c["card_id"])))
@@ -158,7 +214,7 @@ class InventoryView(discord.ui.View):
             await interaction.response.send_message("⚠️ This is not your inventory.", ephemeral=True)
             return
         card_id = int(self.card_select.values[0])
-        card = next((c for c in self.cards if c["card_id"] == card_id), None)
+        card = self.find_card(card_id)
         if not card:
             await interaction.response.send_message("⚠️ Card not found.", ephemeral=True)
             return
@@ -167,7 +223,7 @@ class InventoryView(discord.ui.View):
             "attack": card.get("u_attack"),
             "speed": card.get("u_speed")
         })
-        level = get_level(card.get("xp", 0))
+        level = card_level(card.get("xp", 0))
         form = card.get("form") or "base"
         embed = discord.Embed(
             title=f"{FORM_EMOJIS.get(form, '')} {card['character_name']}",
@@ -183,19 +239,14 @@ class InventoryView(discord.ui.View):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     def format_page(self) -> discord.Embed:
-        filtered = self.get_filtered_cards()
-        start, end = self.page * self.per_page, (self.page + 1) * self.per_page
-        chunk = filtered[start:end]
-
-        total = len(filtered)
-        awakened = sum(1 for c in filtered if c["form"] == "awakened")
-        event = sum(1 for c in filtered if c["form"] == "event")
+        chunk = self.page_cards()
+        total, awakened, event = self.header_totals()
 
         embed = discord.Embed(
             title=f"🎴 {self.author.display_name}'s Inventory",
             description=(
                 f"💰 Bloodcoins: **{self.balance:,}**\n"
-                f"📄 Page {self.page+1}/{max(1, (len(filtered)-1)//self.per_page+1)}\n"
+                f"📄 Page {self.page+1}/{self.page_count()}\n"
                 f"📦 Total: **{total}** | ✨ {awakened} | 🎉 {event}"
             ),
             color=discord.Color.blurple()
@@ -212,7 +263,7 @@ class InventoryView(discord.ui.View):
                 "attack": c.get("u_attack"),
                 "speed": c.get("u_speed")
             })
-            level = get_level(c.get("xp", 0))
+            level = card_level(c.get("xp", 0))
             form = c.get("form") or "base"
             embed.add_field(
                 name=f"{FORM_EMOJIS.get(form, '')} {c['character_name']} ({form.capitalize()})",
@@ -225,11 +276,7 @@ class InventoryView(discord.ui.View):
         if interaction.user != self.author:
             await interaction.response.send_message("⚠️ This is not your inventory.", ephemeral=True)
             return
-        filtered = self.get_filtered_cards()
-        max_page = (len(filtered) - 1) // self.per_page
-        new_page = self.page + delta
-        if 0 <= new_page <= max_page:
-            self.page = new_page
+        if await self.go_to_page(self.page + delta):
             self.update_card_select()
             await interaction.response.edit_message(embed=self.format_page(), view=self)
 
@@ -239,6 +286,96 @@ class InventoryView(discord.ui.View):
         if self.message:
             await self.message.edit(view=self)
 
+# Keyset order per sort mode: (sort expression, direction). Ties are broken on card id
+# in the same direction so a (sort_key, card_id) row comparison gives a stable cursor.
+PAGE_ORDER = {
+    "name": ("c.character_name", "ASC"),
+    "quantity": ("uc.quantity", "DESC"),
+    "level": ("COALESCE(uc.xp, 0)", "DESC"),
+}
+
+class PagedInventoryView(InventoryView):
+    """
+    Inventory for large collections: only the current page is held in memory,
+    fetched from Postgres with keyset pagination for each sort and form filter.
+    """
+
+    def __init__(self, pool, player_id: int, counts: Dict[str, int], balance: int, author: discord.Member):
+        self.pool = pool
+        self.player_id = player_id
+        self.counts = counts
+        self.rows: List[Dict] = []
+        self.cursors: List[Optional[tuple]] = [None]  # start cursor of each visited page
+        self.has_next = False
+        super().__init__([], balance, author)
+
+    async def fetch_page(self, cursor: Optional[tuple]) -> List[Dict]:
+        key, direction = PAGE_ORDER.get(self.sort_mode, PAGE_ORDER["name"])
+        params = [self.player_id]
+        clauses = ["uc.user_id = $1"]
+        if self.current_form != "all":
+            params.append(self.current_form)
+            clauses.append(f"c.form = ${len(params)}")
+        if cursor is not None:
+            params.extend(cursor)
+            op = ">" if direction == "ASC" else "<"
+            clauses.append(f"({key}, c.id) {op} (${len(params) - 1}, ${len(params)})")
+
+        rows = await self.pool.fetch(f"""
+            SELECT
+                c.id AS card_id, c.character_name, c.form, c.image_url, c.series,
+                uc.quantity, uc.xp,
+                uc.health AS u_health, uc.attack AS u_attack, uc.speed AS u_speed,
+                {key} AS sort_key
+            FROM user_cards uc
+            JOIN cards c ON c.id = uc.card_id
+            WHERE {" AND ".join(clauses)}
+            ORDER BY {key} {direction}, c.id {direction}
+            LIMIT {self.per_page + 1}
+        """, *params)
+        return list(rows)
+
+    async def load_page(self, page: int):
+        rows = await self.fetch_page(self.cursors[page])
+        self.has_next = len(rows) > self.per_page
+        self.rows = rows[:self.per_page]
+        self.page = page
+        if self.has_next and len(self.cursors) == page + 1:
+            last = self.rows[-1]
+            self.cursors.append((last["sort_key"], last["card_id"]))
+
+    async def reload(self):
+        self.cursors = [None]
+        await self.load_page(0)
+
+    def page_cards(self) -> List[Dict]:
+        return self.rows
+
+    def page_count(self) -> int:
+        total = self.header_totals()[0]
+        return max(1, (total - 1) // self.per_page + 1)
+
+    def header_totals(self) -> tuple[int, int, int]:
+        awakened = self.counts.get("awakened", 0)
+        event = self.counts.get("event", 0)
+        if self.current_form == "all":
+            return sum(self.counts.values()), awakened, event
+        total = self.counts.get(self.current_form, 0)
+        return (
+            total,
+            total if self.current_form == "awakened" else 0,
+            total if self.current_form == "event" else 0
+        )
+
+    def find_card(self, card_id: int) -> Optional[Dict]:
+        return next((c for c in self.rows if c["card_id"] == card_id), None)
+
+    async def go_to_page(self, page: int) -> bool:
+        if page < 0 or page >= len(self.cursors):
+            return False
+        await self.load_page(page)
+        return True
+
 class Inventory(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -248,38 +385,50 @@ class Inventory(commands.Cog):
         user = member or ctx.author
         discord_id = str(user.id)
 
-        async with db_transaction(self.bot.db) as conn:
-            player_id = await conn.fetchval("SELECT id FROM players WHERE discord_id = $1", discord_id)
-            if not player_id:
+        snapshot = await self.bot.inventory_cache.get(discord_id)
+        if snapshot is None:
+            snapshot = await self.load_snapshot(discord_id)
+            if snapshot is None:
                 await ctx.send("⚠️ You don't have a profile yet. Use `wregister` to create one.")
                 return
 
-            rows = await conn.fetch("""
-                SELECT
-                    c.id AS card_id, c.character_name, c.form, c.image_url, c.series,
-                    uc.quantity, uc.xp,
-                    uc.health AS u_health, uc.attack AS u_attack, uc.speed AS u_speed
-                FROM user_cards uc
-                JOIN cards c ON c.id = uc.card_id
-                WHERE uc.user_id = $1
-                ORDER BY 
-                    CASE c.form
-                        WHEN 'awakened' THEN 1
-                        WHEN 'event' THEN 2
-                        ELSE 3
-                    END,
-                    c.character_name
-            """, player_id)
-
-            balance = await conn.fetchval("SELECT bloodcoins FROM players WHERE discord_id = $1", discord_id)
-
-        if not rows:
+        rows, counts, balance = snapshot["rows"], snapshot["counts"], snapshot["balance"]
+        if rows is not None and not rows:
             await ctx.send("📭 Your inventory is empty. Use `ww` to get cards!")
             return
 
-        view = InventoryView(rows, balance, user)
+        if rows is None:
+            view = PagedInventoryView(self.bot.db, snapshot["player_id"], counts, balance, user)
+            await view.reload()
+            view.update_card_select()
+        else:
+            view = InventoryView(rows, balance, user)
         message = await ctx.send(embed=view.format_page(), view=view)
         view.message = message
 
+    async def load_snapshot(self, discord_id: str) -> Optional[Dict]:
+        """Reads the inventory from Postgres and stores it in the snapshot cache."""
+        async with db_transaction(self.bot.db) as conn:
+            player = await queries.fetchrow(conn, "players.balance", discord_id)
+            if not player:
+                return None
+            player_id, balance = player["id"], player["bloodcoins"]
+
+            counts = await self.get_form_counts(conn, player_id)
+            if sum(counts.values()) > settings.INVENTORY_PAGED_THRESHOLD:
+                rows = None
+            else:
+                rows = await queries.fetch(conn, "inventory.all", player_id)
+
+        await self.bot.inventory_cache.put(discord_id, player_id, balance, counts, rows)
+        return {"player_id": player_id, "balance": balance, "counts": counts, "rows": rows}
+
+    async def get_form_counts(self, conn, player_id: int) -> Dict[str, int]:
+        """Per-form card counts for the inventory header, from the collection counters."""
+        row = await queries.fetchrow(conn, "inventory.counts", player_id)
+        if not row:
+            return {form: 0 for form in FORM_EMOJIS}
+        return {"base": row["base_cards"], "awakened": row["awakened_cards"], "event": row["event_cards"]}
+
 async def setup(bot: commands.Bot):
     await bot.add_cog(Inventory(bot))
@@ -0,0 +1,61 @@
+import discord
+from discord.ext import commands
+from utils.leaderboard import split_level_score
+import queries
+
+BOARD_ALIASES = {
+    "coins": "coins", "coin": "coins", "blood": "coins", "bloodcoins": "coins",
+    "level": "level", "lvl": "level", "xp": "level",
+    "cards": "collection", "collection": "collection", "col": "collection",
+}
+
+BOARD_TITLES = {
+    "coins": "💰 Richest Players",
+    "level": "📈 Highest Levels",
+    "collection": "🃏 Biggest Collections",
+}
+
+MEDALS = ["🥇", "🥈", "🥉"]
+
+def format_score(board: str, score: float) -> str:
+    if board == "level":
+        level, xp = split_level_score(score)
+        return f"Lvl {level} • {xp:,} XP"
+    if board == "coins":
+        return f"{int(score):,} BloodCoins"
+    return f"{int(score):,} cards"
+
+class Leaderboard(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.command(name="top", aliases=["lb"])
+    async def top(self, ctx, board: str = "coins"):
+        board = BOARD_ALIASES.get(board.lower())
+        if not board:
+            return await ctx.send("⚠️ Unknown leaderboard. Use: `coins`, `level` or `cards`.")
+
+        top = await self.bot.leaderboard.top(board, 10)
+        if not top:
+            return await ctx.send("📭 The leaderboard is empty for now.")
+
+        async with self.bot.db.acquire() as conn:
+            names = await queries.fetch(conn, "players.names", [player_id for player_id, _ in top])
+        me = await self.bot.identity.player_id(str(ctx.author.id))
+        names = {r["id"]: r["name"] for r in names}
+
+        lines = []
+        for i, (player_id, score) in enumerate(top):
+            prefix = MEDALS[i] if i < len(MEDALS) else f"`#{i + 1}`"
+            lines.append(f"{prefix} **{names.get(player_id, 'Unknown')}** — {format_score(board, score)}")
+
+        embed = discord.Embed(title=BOARD_TITLES[board], description="\n".join(lines), color=discord.Color.gold())
+        if me:
+            mine = await self.bot.leaderboard.rank(board, me)
+            if mine:
+                rank, score = mine
+                embed.set_footer(text=f"Your rank: #{rank} • {format_score(board, score)}")
+        await ctx.send(embed=embed)
+
+async def setup(bot):
+    await bot.add_cog(Leaderboard(bot))
@@ -2,6 +2,8 @@ import discord
 from discord.ext import commands
 from typing import Optional
 from utils.db import db_transaction
+from utils.progression import apply_xp, xp_to_next
+import queries
 
 FORM_EMOJIS = {
     "base": "🟦",
@@ -16,32 +18,23 @@ class Profile(commands.Cog):
     @commands.command(name="profile", aliases=["p"])
     async def profile(self, ctx: commands.Context, member: Optional[discord.Member] = None):
         user = member or ctx.author
-        discord_id = str(user.id)
+        player_id = await self.bot.identity.player_id(str(user.id))
+        if not player_id:
+            await ctx.send("⚠️ This user does not have a profile yet.")
+            return
 
         async with db_transaction(self.bot.db) as conn:
-            profile = await conn.fetchrow("""
-                SELECT discord_id, name, bloodcoins, noblecoins, level, xp,
-                       created_at, updated_at, achievements, avatar_url
-                FROM players
-                WHERE discord_id = $1
-            """, discord_id)
+            # Collection counters are maintained incrementally (sql/02_collection_stats.sql)
+            profile = await queries.fetchrow(conn, "profile.by_id", player_id)
 
             if not profile:
                 await ctx.send("⚠️ This user does not have a profile yet.")
                 return
 
-            stats = await conn.fetchrow("""
-                SELECT 
-                    COUNT(*) AS total,
-                    COUNT(*) FILTER (WHERE c.form = 'base') AS base,
-                    COUNT(*) FILTER (WHERE c.form = 'awakened') AS awakened,
-                    COUNT(*) FILTER (WHERE c.form = 'event') AS event
-                FROM user_cards uc
-                JOIN cards c ON c.id = uc.card_id
-                WHERE uc.user_id = (
-                    SELECT id FROM players WHERE discord_id = $1
-                )
-            """, discord_id)
+        stats = profile
+        # XP/coins from the write-behind buffer aren't in Postgres yet
+        pending_coins, pending_xp = await self.bot.write_behind.pending_player(profile["id"])
+        bloodcoins = (profile["bloodcoins"] or 0) + pending_coins
 
         # 🎨 Embed setup
         color = discord.Color.gold() if stats and stats["awakened"] else discord.Color.blurple()
@@ -52,14 +45,13 @@ class Profile(commands.Cog):
         embed.set_thumbnail(url=profile["avatar_url"] or user.display_avatar.url)
 
         # 💰 Currency
-        embed.add_field(name="💰 BloodCoins", value=f"{profile['bloodcoins']:,}", inline=True)
+        embed.add_field(name="💰 BloodCoins", value=f"{bloodcoins:,}", inline=True)
         embed.add_field(name="💎 Noble Coins", value=f"{profile['noblecoins']:,}", inline=True)
 
         # 📈 Level & XP
-        level = profile["level"] or 1
-        xp = profile["xp"] or 0
-        xp_next = 172
-        progress = int((xp / xp_next) * 20)
+        level, xp, _ = apply_xp(profile["level"], profile["xp"], pending_xp)
+        xp_next = xp_to_next(level)
+        progress = min(int((xp / xp_next) * 20), 20)
         bar = "▰" * progress + "▱" * (20 - progress)
         embed.add_field(
             name="📈 Level",
@@ -87,7 +79,7 @@ class Profile(commands.Cog):
         achievements = []
         if stats and stats["awakened"]:
             achievements.append("✨ Awakened Collector")
-        if profile["bloodcoins"] > 100_000:
+        if bloodcoins > 100_000:
             achievements.append("💎 Wealthy")
         if level >= 10:
             achievements.append("⭐ Level 10+")
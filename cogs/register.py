@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 from utils.db import db_transaction
 from datetime import datetime
+import queries
 
 class Register(commands.Cog):
     def __init__(self, bot):
@@ -16,38 +17,30 @@ class Register(commands.Cog):
         avatar_url = str(discord_user.display_avatar.url)
         discord_tag = f"{discord_user.name}#{discord_user.discriminator}"
 
+        # Get random starter card (before the insert: no profile is created without one)
+        card = self.bot.catalog.pick("base")
+        if not card:
+            await ctx.send("⚠️ No base cards available. Please ask staff to add one.")
+            return
+
         async with db_transaction(self.bot.db) as conn:
-            exists = await conn.fetchval("SELECT 1 FROM players WHERE discord_id = $1", discord_id)
+            # checked on Postgres, not the identity cache: a stale negative entry must not allow a second profile
+            exists = await queries.fetchval(conn, "players.exists", discord_id)
             if exists:
                 await ctx.send(f"⚠️ {username}, you already have a profile.")
                 return
 
             # Create player profile
-            await conn.execute("""
+            player_id = await conn.fetchval("""
                 INSERT INTO players (
                     discord_id, name, discord_tag, bloodcoins, noblecoins, level, xp,
                     created_at, updated_at, avatar_url
                 ) VALUES (
                     $1, $2, $3, 1000, 0, 1, 0, $4, $4, $5
                 )
+                RETURNING id
             """, discord_id, username, discord_tag, datetime.utcnow(), avatar_url)
 
-            # Get internal user_id
-            player_id = await conn.fetchval("SELECT id FROM players WHERE discord_id = $1", discord_id)
-
-            # Get random starter card
-            card = await conn.fetchrow("""
-                SELECT id, character_name, form, image_url, series
-                FROM cards
-                WHERE form = 'base'
-                ORDER BY random()
-                LIMIT 1
-            """)
-
-            if not card:
-                await ctx.send("⚠️ No base cards available. Please ask staff to add one.")
-                return
-
             # Assign starter card
             await conn.execute("""
                 INSERT INTO user_cards (user_id, card_id, quantity)
@@ -56,6 +49,10 @@ class Register(commands.Cog):
                 DO UPDATE SET quantity = user_cards.quantity + 1
             """, player_id, card["id"])
 
+        await self.bot.identity.invalidate(discord_id)
+        await self.bot.inventory_cache.invalidate(discord_id)
+        await self.bot.leaderboard.update(player_id, coins=1000, level=(1, 0), collection=1)
+
         embed = discord.Embed(
             title="✅ Profile Created!",
             description=f"A new profile has been created for **{username}**.",
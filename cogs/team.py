@@ -3,6 +3,7 @@ from discord.ext import commands
 from discord.ui import View, Button
 from utils.db import db_transaction
 from cogs.entities import entity_from_db
+import queries
 
 class TeamView(View):
     def __init__(self, entities: list, author: discord.User):
@@ -47,64 +48,43 @@ class Team(commands.Cog):
 
         discord_id = str(ctx.author.id)
 
+        user_id = await self.bot.identity.player_id(discord_id)
+        if not user_id:
+            return await ctx.send("⚠️ You don't have a profile yet. Use `wregister`.")
+
         async with db_transaction(self.bot.db) as conn:
-            user_id = await conn.fetchval("SELECT id FROM players WHERE discord_id = $1", discord_id)
-            if not user_id:
-                return await ctx.send("⚠️ You don't have a profile yet. Use `wregister`.")
-
-            owned = await conn.fetch("""
-                SELECT uc.card_id, c.code
-                FROM user_cards uc
-                JOIN cards c ON c.id = uc.card_id
-                WHERE uc.user_id = $1
-            """, user_id)
-
-            code_map = {row["code"].lower(): row["card_id"] for row in owned}
-            card_ids = []
-
-            for code in codes:
-                normalized = code.lower().strip()
+            # Only the requested codes are resolved, through the lower(code) index
+            wanted = [code.lower().strip() for code in codes]
+            owned = await queries.fetch(conn, "team.resolve_codes", user_id, wanted)
+
+            code_map = {row["code"]: row["card_id"] for row in owned}
+            for code, normalized in zip(codes, wanted):
                 if normalized not in code_map:
                     return await ctx.send(f"❌ You don't own a card with code `{code}`.")
-                card_ids.append(code_map[normalized])
-
-            await conn.execute("DELETE FROM player_team WHERE user_id = $1", user_id)
+            card_ids = [code_map[normalized] for normalized in wanted]
 
-            for slot, card_id in enumerate(card_ids, start=1):
-                await conn.execute("""
-                    INSERT INTO player_team (user_id, card_id, slot)
-                    VALUES ($1, $2, $3)
-                """, user_id, card_id, slot)
+            await queries.execute(conn, "team.clear", user_id)
+            await queries.execute(conn, "team.insert", user_id, card_ids)
 
-        await ctx.send(f"✅ Your team has been updated with {len(card_ids)} card(s).")
+        await self.bot.team_cache.invalidate(user_id)
+        # the queued team power is stale now
+        requeue = ""
+        if await self.bot.matchmaker.leave(user_id):
+            requeue = "\nℹ️ You left the battle queue, use `wbattle` to search again with this team."
+        await ctx.send(f"✅ Your team has been updated with {len(card_ids)} card(s).{requeue}")
 
     @commands.command(name="team")
     async def show_team(self, ctx):
         discord_id = str(ctx.author.id)
 
-        async with db_transaction(self.bot.db) as conn:
-            user_id = await conn.fetchval("SELECT id FROM players WHERE discord_id = $1", discord_id)
-            if not user_id:
-                return await ctx.send("⚠️ You don't have a profile yet. Use `wregister`.")
-
-            rows = await conn.fetch("""
-                SELECT pt.slot, pt.is_captain,
-                       c.id AS card_id, c.character_name, c.form, c.image_url, c.series,
-                       uc.xp, uc.health, uc.attack, uc.speed
-                FROM player_team pt
-                JOIN user_cards uc ON uc.card_id = pt.card_id AND uc.user_id = pt.user_id
-                JOIN cards c ON c.id = pt.card_id
-                WHERE pt.user_id = $1
-                ORDER BY pt.slot
-            """, user_id)
+        user_id = await self.bot.identity.player_id(discord_id)
+        if not user_id:
+            return await ctx.send("⚠️ You don't have a profile yet. Use `wregister`.")
 
+        rows = await self.bot.team_cache.roster(self.bot.db, user_id)
         if not rows:
             return await ctx.send("ℹ️ Your team is empty. Use `teamset` to define it.")
 
-        rows = [dict(r) for r in rows]
-        for row in rows:
-            row["description"] = row.get("series") or "Unknown"
-
         entities = [entity_from_db(card_row=row, user_card_row=row) for row in rows]
         view = TeamView(entities, ctx.author)
         embed = entities[0].to_embed(title_prefix="📦 Slot 1:")
@@ -1,44 +1,38 @@
+import datetime
 import discord
 from discord.ext import commands
 from discord.ui import View, Button
-import asyncio
-import random
-import time
-import requests
 from io import BytesIO
-from PIL import Image
-from models.card import Card
-from utils.leveling import add_xp
-from utils.db import db_transaction
-from datetime import datetime
-
-def render_combined_image(card1, card2, max_size=(300, 300), spacing=24):
-    try:
-        img1 = Image.open(BytesIO(requests.get(card1.image_url, timeout=5).content)).convert("RGBA")
-        img2 = Image.open(BytesIO(requests.get(card2.image_url, timeout=5).content)).convert("RGBA")
-
-        img1.thumbnail(max_size, Image.LANCZOS)
-        img2.thumbnail(max_size, Image.LANCZOS)
-
-        height = max(img1.height, img2.height)
-        total_width = img1.width + img2.width + spacing
-
-        combined = Image.new("RGBA", (total_width, height), (0, 0, 0, 0))
-        combined.paste(img1, (0, 0))
-        combined.paste(img2, (img1.width + spacing, 0))
-
-        buffer = BytesIO()
-        combined.save(buffer, format="PNG", optimize=True)
-        buffer.seek(0)
-        return buffer
-
-    except Exception as e:
-        print(f"❌ Failed to render combined image: {e}")
-        fallback = Image.new("RGBA", (max_size[0]*2 + spacing, max_size[1]), (30, 30, 30, 255))
-        buffer = BytesIO()
-        fallback.save(buffer, format="PNG")
-        buffer.seek(0)
-        return buffer
+import queries
+from utils.render import render_combined_image
+from utils.daily_claims import utc_today
+from config import settings
+
+CLAIM_BLOODCOINS = 10
+CLAIM_XP = 5
+MESSAGE_LIMIT = 2000  # Discord message length limit
+
+def mention_chunks(user_ids: list[int], prefix: str, suffix: str, limit: int = MESSAGE_LIMIT) -> list[str]:
+    """Splits the mentions into as few messages as possible, each under `limit` characters."""
+    room = limit - len(prefix) - len(suffix)
+    messages, current = [], []
+    size = 0
+    for user_id in user_ids:
+        mention = f"<@{user_id}>"
+        if current and size + 1 + len(mention) > room:
+            messages.append(prefix + " ".join(current) + suffix)
+            current, size = [], 0
+        size += len(mention) + (1 if current else 0)
+        current.append(mention)
+    if current:
+        messages.append(prefix + " ".join(current) + suffix)
+    return messages
+
+async def render_drop_image(bot, card1, card2):
+    """Loads both card images from the local cache (fetching misses concurrently), then composes them in the render pool."""
+    data1, data2 = await bot.image_cache.get_many((card1.id, card1.image_url), (card2.id, card2.image_url))
+    png = await bot.renderer.render(render_combined_image, data1, data2)
+    return BytesIO(png)
 
 class WarpDropView(View):
     def __init__(self, bot, user, card1, card2):
@@ -74,20 +68,26 @@ class WarpDropView(View):
         discord_id = str(interaction.user.id)
         card_code = card.code
 
-        async with db_transaction(self.bot.db) as conn:
-            player_id = await conn.fetchval("SELECT id FROM players WHERE discord_id = $1", discord_id)
-            if not player_id:
-                await interaction.followup.send("⚠️ You don't have a profile yet. Use `wregister`.", ephemeral=True)
-                return
-
-            await conn.execute("""
-                INSERT INTO user_cards (user_id, card_id, quantity, code)
-                VALUES ($1, $2, 1, $3)
-                ON CONFLICT (user_id, card_id)
-                DO UPDATE SET quantity = user_cards.quantity + 1
-            """, player_id, card.id, card_code)
+        # Player lookup, card upsert, coins and XP/level-up in a single server-side call
+        async with self.bot.db.acquire() as conn:
+            claim = await queries.fetchrow(
+                conn, "warp.claim", discord_id, card.id, card_code, CLAIM_BLOODCOINS, CLAIM_XP
+            )
 
-            await conn.execute("UPDATE players SET bloodcoins = bloodcoins + 10 WHERE id = $1", player_id)
+        if not claim:
+            await interaction.followup.send("⚠️ You don't have a profile yet. Use `wregister`.", ephemeral=True)
+            return
+        await self.bot.inventory_cache.invalidate(discord_id)
+        await self.bot.team_cache.invalidate(claim["player_id"])
+        await self.bot.leaderboard.update(
+            claim["player_id"], coins=claim["bloodcoins"], level=(claim["level"], claim["xp"])
+        )
+        if claim["card_quantity"] == 1:
+            await self.bot.leaderboard.incr("collection", claim["player_id"], 1)
+        await self.bot.quests.report_many([
+            (claim["player_id"], "warp_claim", 1),
+            (claim["player_id"], "level_up", claim["levels_gained"]),
+        ])
 
         await interaction.followup.send(
             f"✅ You claimed **{card.character_name}**!\nForm: `{card.form}`\nCode: `{card_code}`",
@@ -95,7 +95,8 @@ class WarpDropView(View):
         )
 
         await interaction.channel.send(f"🎉 {interaction.user.mention} just claimed **{card.character_name}**!")
-        await add_xp(self.bot, interaction.user.id, 5)
+        if claim["leveled_up"]:
+            await interaction.channel.send(f"📈 {interaction.user.mention} reached **Level {claim['level']}**!")
 
     @discord.ui.button(label="Claim 1", style=discord.ButtonStyle.primary, row=0)
     async def claim_one(self, interaction: discord.Interaction, button: Button):
@@ -108,49 +109,34 @@ class WarpDropView(View):
 class Warp(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.cooldowns = {}
+        bot.reminders.register("warp", self.send_warp_reminders)
+
+    async def send_warp_reminders(self, channel_id: int, user_ids: list[int]):
+        channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+        # a backlog after a restart can hold hundreds of users for one channel
+        for content in mention_chunks(user_ids, "🔔 ", " **Warp** is available again!"):
+            await channel.send(content)
 
     @commands.command(name="warp", aliases=["w"])
     async def warp(self, ctx):
         discord_id = str(ctx.author.id)
-        now = int(time.time())
 
-        if discord_id in self.cooldowns and self.cooldowns[discord_id] > now:
-            ready_at = self.cooldowns[discord_id]
+        cooldown_seconds = settings.DRAW_COOLDOWN_SEC
+        acquired, ready_at = await self.bot.cooldowns.acquire("warp", discord_id, cooldown_seconds)
+        if not acquired:
             return await ctx.send(f"⏳ The portal is sealed... <t:{ready_at}:R>")
 
-        cooldown_seconds = 600
-        ready_at = now + cooldown_seconds
-        self.cooldowns[discord_id] = ready_at
-
-        async with db_transaction(self.bot.db) as conn:
-            rows = await conn.fetch("""
-                SELECT id, character_name, form, image_url, series, code
-                FROM cards
-                WHERE form = 'base' AND approved = TRUE
-                ORDER BY random()
-                LIMIT 2
-            """)
-            if len(rows) == 0:
-                await ctx.send("⚠️ No approved base cards available.")
-                return
-            elif len(rows) == 1:
-                rows.append(rows[0])
-
-        cards = []
-        for row in rows:
-            card = Card(
-                id=row["id"],
-                character_name=row["character_name"],
-                form=row["form"],
-                image_url=row["image_url"],
-                series=row["series"],
-                code=row["code"],
-                created_at=datetime.utcnow()
-            )
-            cards.append(card)
+        rows = self.bot.catalog.sample("base", 2, approved=True)
+        if len(rows) == 0:
+            await ctx.send("⚠️ No approved base cards available.")
+            return
+        elif len(rows) == 1:
+            rows.append(rows[0])
 
-        combined = render_combined_image(cards[0], cards[1])
+        # Catalog entries are already slotted CardRecords: no ORM objects needed
+        cards = rows
+
+        combined = await render_drop_image(self.bot, cards[0], cards[1])
         file = discord.File(combined, filename="drop.png")
 
         lines = [
@@ -163,22 +149,34 @@ class Warp(commands.Cog):
         msg = await ctx.send(content=intro, file=file, view=view)
         view.message = msg
 
-        async def reminder():
-            await asyncio.sleep(cooldown_seconds)
-            await ctx.send(f"🔔 {ctx.author.mention} **Warp** is available again!")
-
-        self.bot.loop.create_task(reminder())
+        await self.bot.reminders.schedule("warp", ctx.channel.id, ctx.author.id, ready_at)
 
     @commands.command(name="cooldown", aliases=["cd"])
     async def cooldown(self, ctx):
         discord_id = str(ctx.author.id)
-        now = int(time.time())
-        tomorrow_midnight = (now // 86400 + 1) * 86400
-        warp_ready = self.cooldowns.get(discord_id, now)
+        player_id = await self.bot.identity.player_id(discord_id)
+
+        # warp cooldown key and today's daily bitmap in one round trip
+        async with self.bot.redis.pipeline(transaction=False) as pipe:
+            pipe.get(self.bot.cooldowns.key("warp", discord_id))
+            if player_id:
+                pipe.getbit(self.bot.daily_claims.key(utc_today()), player_id)
+            warp_ready, *claimed = await pipe.execute()
+        warp_ready = int(warp_ready) if warp_ready else None
+
+        # daily resets at UTC midnight
+        daily_ready = None
+        if claimed and claimed[0]:
+            daily_ready = int(datetime.datetime.combine(
+                utc_today() + datetime.timedelta(days=1), datetime.time.min, tzinfo=datetime.timezone.utc
+            ).timestamp())
+
+        def fmt(ready_at):
+            return f"<t:{ready_at}:R>" if ready_at else "✅ Ready"
 
         embed = discord.Embed(title="⏳ Cooldowns", color=discord.Color.blurple())
-        embed.add_field(name="Daily", value=f"<t:{tomorrow_midnight}:R>", inline=False)
-        embed.add_field(name="Warp", value=f"<t:{warp_ready}:R>", inline=False)
+        embed.add_field(name="Daily", value=fmt(daily_ready), inline=False)
+        embed.add_field(name="Warp", value=fmt(warp_ready), inline=False)
         await ctx.send(embed=embed)
 
 async def setup(bot):
@@ -4,10 +4,65 @@ from pydantic_settings import BaseSettings  # ✅ nouveau import
 class Settings(BaseSettings):
     DISCORD_TOKEN: str
     DATABASE_URL: str
+    DB_POOL_WARM_SIZE: int = 5  # connections opened and prepared at startup
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_MAX_INACTIVE_SEC: float = 0  # 0 keeps warmed connections open
+    DB_PREPARE_STATEMENTS: bool = True  # off behind a transaction-mode pgbouncer (also disables asyncpg's statement cache)
     REDIS_URL: str
     BOT_PREFIX: str = "!"
     DRAW_COOLDOWN_SEC: int = 600  # 10 minutes
 
+    # --- Image fetching ---
+    IMAGE_FETCH_TIMEOUT_SEC: float = 5.0
+    IMAGE_FETCH_PER_HOST: int = 4
+    IMAGE_BREAKER_THRESHOLD: int = 3
+    IMAGE_BREAKER_RESET_SEC: float = 30.0
+
+    # --- Image rendering ---
+    RENDER_WORKERS: int = 2
+    RENDER_MAX_PENDING: int = 32
+    RENDER_TIMEOUT_SEC: float = 3.0
+
+    # --- Card image cache ---
+    IMAGE_CACHE_DIR: str = ".cache/cards"
+    IMAGE_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    IMAGE_CACHE_REVALIDATE_SEC: float = 86400.0
+
+    # --- Card catalog ---
+    CATALOG_REFRESH_SEC: float = 300.0
+
+    # --- Inventory ---
+    INVENTORY_PAGED_THRESHOLD: int = 300  # above this many cards, winv pages from Postgres
+    INVENTORY_SNAPSHOT_TTL_SEC: int = 300
+
+    # --- Teams ---
+    TEAM_CACHE_TTL_SEC: int = 3600
+
+    # --- Reminders ---
+    REMINDER_BACKEND: str = "redis"  # "redis" (durable) or "local" (in-process timer wheel)
+    REMINDER_TICK_SEC: float = 1.0
+    REMINDER_BATCH: int = 500
+
+    # --- discord_id -> player id cache ---
+    IDENTITY_CACHE_SIZE: int = 10_000
+    IDENTITY_CACHE_TTL_SEC: float = 3600.0
+    IDENTITY_NEGATIVE_TTL_SEC: float = 30.0  # unregistered users
+    IDENTITY_REDIS_TIER: bool = True  # invalidations are broadcast over Redis pub/sub either way
+
+    # --- PvP matchmaking (window in team power points) ---
+    MATCH_BACKEND: str = "redis"  # "redis" (shared queue) or "local" (in-process)
+    MATCH_BASE_WINDOW: float = 50.0
+    MATCH_WIDEN_PER_SEC: float = 5.0
+    MATCH_MAX_WINDOW: float = 1000.0
+    MATCH_TICK_SEC: float = 2.0
+    MATCH_TIMEOUT_SEC: float = 300.0
+
+    # --- Daily claims (Redis bitmaps, one per UTC day) ---
+    DAILY_CLAIM_RETENTION_DAYS: int = 90
+
+    # --- Write-behind (XP, buddy XP, quest progress) ---
+    WRITE_BEHIND_FLUSH_SEC: float = 2.0
+
     class Config:
         env_file = ".env"
 
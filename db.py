@@ -1,10 +1,15 @@
 # db.py
+import asyncio
 import asyncpg
 from contextlib import asynccontextmanager
+from pathlib import Path
 from config import settings
+from queries import QueryConnection, prepare_statements
 
 _pool = None
 
+SQL_DIR = Path(__file__).parent / "sql"
+
 async def init_db():
     """
     Initialise le pool PostgreSQL et le retourne.
@@ -13,10 +18,37 @@ async def init_db():
     _pool = await asyncpg.create_pool(
         dsn=settings.DATABASE_URL,
         min_size=1,
-        max_size=10
+        max_size=settings.DB_POOL_MAX_SIZE,
+        max_inactive_connection_lifetime=settings.DB_POOL_MAX_INACTIVE_SEC,
+        connection_class=QueryConnection,
+        init=prepare_statements,  # chaque connexion prépare les requêtes de queries.py
+        # sans requêtes préparées (pgbouncer en mode transaction), pas de cache nommé non plus
+        statement_cache_size=100 if settings.DB_PREPARE_STATEMENTS else 0
     )
     return _pool   # <-- on retourne le pool pour l’attacher à bot.db
 
+async def apply_sql(pool):
+    """
+    Exécute les scripts de sql/ dans l'ordre des noms de fichiers.
+    Les scripts doivent être idempotents (CREATE OR REPLACE, IF NOT EXISTS).
+    """
+    async with pool.acquire() as conn:
+        for path in sorted(SQL_DIR.glob("*.sql")):
+            await conn.execute(path.read_text(encoding="utf-8"))
+        # le schéma a pu changer: on re-prépare sur cette connexion
+        await prepare_statements(conn)
+
+async def warm_pool(pool, size: int):
+    """
+    Ouvre `size` connexions d'un coup (chacune passe par prepare_statements)
+    pour que les premières commandes après un déploiement ne paient ni la
+    connexion ni la préparation.
+    """
+    size = min(size, pool.get_max_size())
+    conns = await asyncio.gather(*(pool.acquire() for _ in range(size)))
+    await asyncio.gather(*(pool.release(conn) for conn in conns))
+    return size
+
 def pool():
     """
     Retourne le pool global (fallback si besoin).
@@ -0,0 +1,61 @@
+"""
+Lightweight read-only records built straight from asyncpg rows.
+
+ORM models (models/card.py, models/user_card.py) stay for the admin/buddy
+SQLAlchemy paths; hot paths (catalog, warp, inventory, team, battle) use these instead.
+Records are plain tuples underneath and support both attribute access
+(`card.code`) and the mapping-style access the cogs already use on asyncpg
+rows (`card["code"]`, `card.get("series")`).
+"""
+from collections import namedtuple
+
+
+class _RecordMixin:
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        """Builds a record from an asyncpg Record or dict; missing columns become None."""
+        return cls._make(map(row.get, cls._fields))
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            # only column names: "count", "index", "_asdict"... are tuple methods, not columns
+            if key in self._fields:
+                return getattr(self, key)
+            raise KeyError(key)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._fields else default
+
+
+class CardRecord(_RecordMixin, namedtuple("CardRecord", (
+    "id", "character_name", "form", "image_url", "series", "code", "description", "approved"
+))):
+    """One row of `cards`."""
+    __slots__ = ()
+
+
+class UserCardRecord(_RecordMixin, namedtuple("UserCardRecord", (
+    "card_id", "character_name", "form", "image_url", "series", "code",
+    "quantity", "xp", "health", "attack", "speed"
+))):
+    """One owned card: `user_cards` joined with `cards`."""
+    __slots__ = ()
+
+
+class InventoryRecord(_RecordMixin, namedtuple("InventoryRecord", (
+    "card_id", "character_name", "form", "image_url", "series",
+    "quantity", "xp", "u_health", "u_attack", "u_speed"
+))):
+    """One `winv` row, in the column order of the inventory query."""
+    __slots__ = ()
+
+
+class TeamSlotRecord(_RecordMixin, namedtuple("TeamSlotRecord", (
+    "slot", "is_captain", "card_id", "character_name", "form", "image_url", "series",
+    "quantity", "xp", "health", "attack", "speed"
+))):
+    """One `player_team` slot joined with its owned card and card row."""
+    __slots__ = ()
@@ -0,0 +1,243 @@
+# queries.py
+"""
+Named hot statements, prepared once per pooled connection.
+
+db.init_db creates the pool with QueryConnection and prepare_statements as
+its `init` hook, so each connection prepares everything in QUERIES when it
+opens and keeps the PreparedStatement objects in `conn.statements`. Call
+sites use the statement name instead of an inline SQL literal:
+
+    player = await queries.fetchrow(conn, "daily.reward", player_id, 10000)
+
+On a plain connection (or with DB_PREPARE_STATEMENTS off) the same helpers
+fall back to conn.fetch*/execute with the statement text. A statement
+invalidated by a schema change is dropped and prepared again.
+"""
+import logging
+
+import asyncpg
+
+from config import settings
+
+log = logging.getLogger(__name__)
+
+QUERIES: dict[str, str] = {
+    # --- Players ---
+    "players.identity": "SELECT id FROM players WHERE discord_id = $1",
+    "players.exists": "SELECT 1 FROM players WHERE discord_id = $1",
+    "players.names": "SELECT id, name FROM players WHERE id = ANY($1::int[])",
+    "players.balance": "SELECT id, bloodcoins FROM players WHERE discord_id = $1",
+    "profile.by_id": """
+        SELECT p.id, p.discord_id, p.name, p.bloodcoins, p.noblecoins, p.level, p.xp,
+               p.created_at, p.updated_at, p.achievements, p.avatar_url,
+               s.distinct_cards AS total, s.base_cards AS base,
+               s.awakened_cards AS awakened, s.event_cards AS event
+        FROM players p
+        LEFT JOIN player_collection_stats s ON s.player_id = p.id
+        WHERE p.id = $1
+    """,
+
+    # --- Daily / warp / gacha ---
+    "daily.reward": """
+        UPDATE players SET bloodcoins = bloodcoins + $2 WHERE id = $1
+        RETURNING id, bloodcoins, level, xp, buddy_card_id
+    """,
+    "warp.claim": "SELECT * FROM claim_card($1, $2, $3, $4, $5)",
+    # Deduct keys and advance the pity counter in one statement; returns the pre-update counter
+    "gacha.spend_keys": """
+        UPDATE players p
+        SET gate_keys = p.gate_keys - $1,
+            pulls = CASE WHEN p.pulls + $1 >= $3 THEN 0 ELSE p.pulls + $1 END
+        FROM (SELECT id, pulls FROM players WHERE discord_id = $2 FOR UPDATE) old
+        WHERE p.id = old.id AND p.gate_keys >= $1
+        RETURNING p.id, old.pulls AS pulls_before
+    """,
+    # One upsert for the whole multi-summon; duplicates are folded into a single quantity
+    "gacha.add_cards": """
+        INSERT INTO user_cards (user_id, card_id, quantity)
+        SELECT $1, t.card_id, COUNT(*)
+        FROM unnest($2::int[]) AS t(card_id)
+        GROUP BY t.card_id
+        ON CONFLICT (user_id, card_id)
+        DO UPDATE SET quantity = user_cards.quantity + EXCLUDED.quantity
+        RETURNING (xmax = 0) AS inserted
+    """,
+
+    # --- Inventory ---
+    "inventory.counts": """
+        SELECT base_cards, awakened_cards, event_cards
+        FROM player_collection_stats
+        WHERE player_id = $1
+    """,
+    "inventory.all": """
+        SELECT
+            c.id AS card_id, c.character_name, c.form, c.image_url, c.series,
+            uc.quantity, uc.xp,
+            uc.health AS u_health, uc.attack AS u_attack, uc.speed AS u_speed
+        FROM user_cards uc
+        JOIN cards c ON c.id = uc.card_id
+        WHERE uc.user_id = $1
+        ORDER BY
+            CASE c.form
+                WHEN 'awakened' THEN 1
+                WHEN 'event' THEN 2
+                ELSE 3
+            END,
+            c.character_name
+    """,
+
+    # --- Teams / battle ---
+    "team.roster": """
+        SELECT pt.slot, pt.is_captain,
+               c.id AS card_id, c.character_name, c.form, c.image_url, c.series,
+               uc.quantity, uc.xp, uc.health, uc.attack, uc.speed
+        FROM player_team pt
+        JOIN user_cards uc ON uc.card_id = pt.card_id AND uc.user_id = pt.user_id
+        JOIN cards c ON c.id = pt.card_id
+        WHERE pt.user_id = $1
+        ORDER BY pt.slot
+    """,
+    # Only the requested codes are resolved, through the lower(code) index
+    "team.resolve_codes": """
+        SELECT lower(c.code) AS code, uc.card_id
+        FROM cards c
+        JOIN user_cards uc ON uc.card_id = c.id AND uc.user_id = $1
+        WHERE lower(c.code) = ANY($2::text[])
+    """,
+    "team.clear": "DELETE FROM player_team WHERE user_id = $1",
+    "team.insert": """
+        INSERT INTO player_team (user_id, card_id, slot)
+        SELECT $1, t.card_id, t.slot
+        FROM unnest($2::int[]) WITH ORDINALITY AS t(card_id, slot)
+    """,
+    "team.power": "SELECT power FROM team_power WHERE player_id = $1",
+
+    # --- Write-behind flush / quests ---
+    "write_behind.claim_batch": """
+        INSERT INTO write_behind_batches (batch_id) VALUES ($1)
+        ON CONFLICT DO NOTHING
+        RETURNING TRUE
+    """,
+    "write_behind.players": """
+        WITH d AS (
+            SELECT * FROM unnest($1::int[], $2::bigint[], $3::int[]) AS d(id, coins, xp)
+        ), n AS (
+            SELECT p.id, d.coins, x.level, x.xp
+            FROM players p
+            JOIN d ON d.id = p.id
+            CROSS JOIN LATERAL apply_xp(p.level, p.xp, d.xp) x
+            FOR UPDATE OF p
+        )
+        UPDATE players p
+        SET bloodcoins = p.bloodcoins + n.coins, level = n.level, xp = n.xp
+        FROM n
+        WHERE p.id = n.id
+        RETURNING p.discord_id
+    """,
+    "write_behind.buddies": """
+        UPDATE user_cards uc
+        SET xp = uc.xp + d.xp,
+            health = 100 + (card_level(uc.xp + d.xp) - 1) * 5,
+            attack = 10 + (card_level(uc.xp + d.xp) - 1) * 2,
+            speed = 10 + (card_level(uc.xp + d.xp) - 1) * 1
+        FROM unnest($1::int[], $2::int[], $3::int[]) AS d(user_id, card_id, xp), players p
+        WHERE uc.user_id = d.user_id AND uc.card_id = d.card_id AND p.id = uc.user_id
+        RETURNING p.discord_id
+    """,
+    # Applies (user_id, quest_id, amount) rows in one statement
+    "quests.apply_progress": """
+        UPDATE user_quests uq
+        SET progress = uq.progress + d.amount,
+            completed = (uq.progress + d.amount) >= qt.target
+        FROM unnest($1::int[], $2::int[], $3::int[]) AS d(user_id, quest_id, amount),
+             quest_templates qt
+        WHERE uq.user_id = d.user_id
+          AND uq.quest_id = d.quest_id
+          AND qt.quest_id = d.quest_id
+          AND uq.claimed = FALSE
+    """,
+}
+
+
+class QueryConnection(asyncpg.Connection):
+    """Pool connection class holding this connection's prepared statements by name."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.statements: dict = {}  # name -> PreparedStatement
+
+
+async def prepare_statements(conn):
+    """
+    Pool `init` hook: prepares every statement of QUERIES on `conn`.
+    Statements whose tables don't exist yet (first boot, before apply_sql)
+    are skipped and prepared on first use instead.
+    """
+    statements = getattr(conn, "statements", None)
+    if statements is None or not settings.DB_PREPARE_STATEMENTS:
+        return
+    statements.clear()
+    for name, sql in QUERIES.items():
+        try:
+            statements[name] = await conn.prepare(sql)
+        except asyncpg.PostgresError as e:
+            log.debug(f"Statement '{name}' not prepared yet: {e!r}")
+
+
+async def _statement(conn, name: str):
+    statements = getattr(conn, "statements", None)
+    if statements is None or not settings.DB_PREPARE_STATEMENTS:
+        return None
+    stmt = statements.get(name)
+    if stmt is None:
+        stmt = statements[name] = await conn.prepare(QUERIES[name])
+    return stmt
+
+
+# Raised by a prepared statement whose plan no longer matches the schema
+# (result columns or types changed by a later apply_sql, or the statement is
+# gone server side): it has to be prepared again.
+_STALE_ERRORS = (
+    asyncpg.exceptions.InvalidCachedStatementError,
+    asyncpg.exceptions.FeatureNotSupportedError,  # "cached plan must not change result type"
+    asyncpg.exceptions.OutdatedSchemaCacheError,
+    asyncpg.exceptions.InvalidSQLStatementNameError,
+)
+
+def _is_stale(e: Exception) -> bool:
+    if isinstance(e, asyncpg.exceptions.FeatureNotSupportedError):
+        return isinstance(e, asyncpg.exceptions.InvalidCachedStatementError) or "cached plan" in str(e)
+    return isinstance(e, _STALE_ERRORS)
+
+
+async def _run(conn, name: str, prepared_method: str, plain_method: str, args):
+    stmt = await _statement(conn, name)
+    if stmt is None:
+        return await getattr(conn, plain_method)(QUERIES[name], *args)
+    try:
+        return await getattr(stmt, prepared_method)(*args)
+    except _STALE_ERRORS as e:
+        if not _is_stale(e):
+            raise
+        conn.statements.pop(name, None)
+        # inside a transaction the error already aborted it: the caller fails
+        # this once and the next call prepares the statement again
+        if conn.is_in_transaction():
+            raise
+        log.info(f"Statement '{name}' is stale, preparing it again: {e!r}")
+        stmt = await _statement(conn, name)
+        return await getattr(stmt, prepared_method)(*args)
+
+
+async def fetch(conn, name: str, *args) -> list:
+    return await _run(conn, name, "fetch", "fetch", args)
+
+async def fetchrow(conn, name: str, *args):
+    return await _run(conn, name, "fetchrow", "fetchrow", args)
+
+async def fetchval(conn, name: str, *args):
+    return await _run(conn, name, "fetchval", "fetchval", args)
+
+async def execute(conn, name: str, *args):
+    """For statements without a result; prepared statements run through fetch()."""
+    await _run(conn, name, "fetch", "execute", args)
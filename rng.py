@@ -1,13 +1,107 @@
 # rng.py
 import random
+from functools import lru_cache
 
-def weighted_choice(items):
+import numpy as np
+
+_shared = random.Random()
+
+
+def make_rng(seed=None) -> random.Random:
+    """
+    Per-call Python generator. Pass a seed (or an existing Random) for
+    reproducible draws; None falls back to the shared module generator.
+    """
+    if seed is None:
+        return _shared
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+def make_generator(seed=None) -> np.random.Generator:
+    """Per-call NumPy generator for batch draws (seed, Generator or None)."""
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.default_rng(seed)
+
+
+class AliasTable:
+    """
+    Vose alias table: O(n) to build, O(1) per draw.
+    Usage:
+    table = AliasTable([("base", 0.9), ("awakened", 0.095), ("event", 0.005)])
+    table.draw()                       # -> "base"
+    table.draw_many(10, seed=42)       # -> ["base", "awakened", ...]
+    table.draw_indices((1000, 10))     # -> int array of item indices
+    """
+
+    __slots__ = ("items", "n", "prob", "alias", "_prob_np", "_alias_np")
+
+    def __init__(self, items):
+        # items: list[tuple[item, weight]]
+        if not items:
+            raise ValueError("AliasTable needs at least one item")
+        weights = [float(w) for _, w in items]
+        if any(w < 0 for w in weights) or sum(weights) <= 0:
+            raise ValueError("weights must be non-negative with a positive total")
+
+        self.items = [item for item, _ in items]
+        self.n = n = len(items)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = scaled[l] + scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # restes dus aux arrondis flottants: probabilité 1
+        for i in small + large:
+            prob[i] = 1.0
+            alias[i] = i
+
+        self.prob = prob
+        self.alias = alias
+        self._prob_np = np.asarray(prob, dtype=np.float64)
+        self._alias_np = np.asarray(alias, dtype=np.intp)
+
+    def draw_index(self, rng=None) -> int:
+        r = make_rng(rng)
+        u = r.random() * self.n
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def draw(self, rng=None):
+        return self.items[self.draw_index(rng)]
+
+    def draw_indices(self, size, seed=None) -> np.ndarray:
+        """Vectorized draw of item indices with the given shape."""
+        gen = make_generator(seed)
+        idx = gen.integers(0, self.n, size=size)
+        u = gen.random(size=size)
+        return np.where(u < self._prob_np[idx], idx, self._alias_np[idx])
+
+    def draw_many(self, count: int, seed=None) -> list:
+        return [self.items[i] for i in self.draw_indices(count, seed).tolist()]
+
+
+@lru_cache(maxsize=128)
+def _compiled(items: tuple) -> AliasTable:
+    return AliasTable(items)
+
+def weighted_choice(items, rng=None):
     # items: list[tuple[item, weight]]
-    total = sum(w for _, w in items)
-    r = random.uniform(0, total)
-    upto = 0.0
-    for item, weight in items:
-        if upto + weight >= r:
-            return item
-        upto += weight
-    return items[-1][0]
+    # les tables sont mises en cache: appeler deux fois avec les mêmes poids ne recalcule rien
+    try:
+        table = _compiled(tuple(items))
+    except TypeError:  # items non hashables
+        table = AliasTable(items)
+    return table.draw(rng)
@@ -0,0 +1,51 @@
+-- Player XP curve, mirrored from utils/progression.py: 100 XP from level 1
+-- to 2, then x1.2 (rounded down) per level, capped at level 90.
+-- total_xp is the lifetime XP needed to reach `level`, so resolving any XP
+-- grant is one index lookup instead of a loop per level gained.
+CREATE TABLE IF NOT EXISTS xp_levels (
+    level    INT PRIMARY KEY,
+    total_xp BIGINT NOT NULL UNIQUE,
+    xp_next  INT NOT NULL
+);
+
+INSERT INTO xp_levels (level, total_xp, xp_next)
+WITH RECURSIVE curve(level, total_xp, xp_next) AS (
+    -- BIGINT while recursing: xp_next * 6 overflows an INT past level 84
+    SELECT 1, 0::BIGINT, 100::BIGINT
+    UNION ALL
+    SELECT level + 1, total_xp + xp_next, xp_next * 6 / 5 FROM curve WHERE level < 90
+)
+SELECT level, total_xp, xp_next::INT FROM curve
+ON CONFLICT (level) DO UPDATE SET total_xp = EXCLUDED.total_xp, xp_next = EXCLUDED.xp_next
+WHERE (xp_levels.total_xp, xp_levels.xp_next) IS DISTINCT FROM (EXCLUDED.total_xp, EXCLUDED.xp_next);
+
+DELETE FROM xp_levels WHERE level > 90;
+
+-- XP needed to go from `p_level` to `p_level + 1`.
+CREATE OR REPLACE FUNCTION xp_to_next(p_level INT) RETURNS INT
+LANGUAGE sql STABLE AS $$
+    SELECT l.xp_next FROM xp_levels l
+    WHERE l.level = LEAST(GREATEST(COALESCE(p_level, 1), 1), 90)
+$$;
+
+-- Adds `p_gain` XP to (p_level, p_xp) and resolves every level-up it causes.
+-- Usable inside an UPDATE: `CROSS JOIN LATERAL apply_xp(p.level, p.xp, d.xp) x`.
+CREATE OR REPLACE FUNCTION apply_xp(p_level INT, p_xp INT, p_gain INT)
+RETURNS TABLE (level INT, xp INT, xp_next INT)
+LANGUAGE sql STABLE AS $$
+    SELECT l.level, (t.total - l.total_xp)::INT, l.xp_next
+    FROM (
+        SELECT s.total_xp + COALESCE(p_xp, 0) + COALESCE(p_gain, 0) AS total
+        FROM xp_levels s
+        WHERE s.level = LEAST(GREATEST(COALESCE(p_level, 1), 1), 90)
+    ) t
+    CROSS JOIN LATERAL (
+        SELECT * FROM xp_levels x WHERE x.total_xp <= t.total ORDER BY x.total_xp DESC LIMIT 1
+    ) l
+$$;
+
+-- Card level from its XP: flat 100 XP per level.
+CREATE OR REPLACE FUNCTION card_level(p_xp INT) RETURNS INT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT COALESCE(p_xp, 0) / 100 + 1
+$$;
@@ -0,0 +1,48 @@
+-- Warp claim in one round trip: resolve the player, upsert the card,
+-- credit bloodcoins and apply XP with level-ups.
+-- Returns no row when the discord user has no profile.
+-- levels_gained counts every level-up of the claim (quest `level_up` amount).
+-- Dropped first: CREATE OR REPLACE can't change the result columns.
+DROP FUNCTION IF EXISTS claim_card(TEXT, INT, TEXT, INT, INT);
+CREATE FUNCTION claim_card(
+    p_discord_id TEXT, p_card_id INT, p_code TEXT, p_coins INT, p_xp INT
+) RETURNS TABLE (
+    player_id INT, card_quantity INT, bloodcoins BIGINT,
+    level INT, xp INT, xp_next INT, leveled_up BOOLEAN, levels_gained INT
+)
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_level INT;
+    v_xp INT;
+    v_old_level INT;
+BEGIN
+    SELECT p.id, COALESCE(p.level, 1), COALESCE(p.xp, 0)
+      INTO player_id, v_level, v_xp
+      FROM players p
+     WHERE p.discord_id = p_discord_id
+       FOR UPDATE;
+    IF NOT FOUND THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO user_cards AS uc (user_id, card_id, quantity, code)
+    VALUES (player_id, p_card_id, 1, p_code)
+    ON CONFLICT (user_id, card_id)
+    DO UPDATE SET quantity = uc.quantity + 1
+    RETURNING uc.quantity INTO card_quantity;
+
+    v_old_level := v_level;
+    SELECT x.level, x.xp, x.xp_next INTO level, xp, xp_next FROM apply_xp(v_level, v_xp, p_xp) x;
+
+    UPDATE players p
+       SET bloodcoins = p.bloodcoins + p_coins,
+           level = claim_card.level,
+           xp = claim_card.xp
+     WHERE p.id = player_id
+    RETURNING p.bloodcoins INTO bloodcoins;
+
+    levels_gained := level - v_old_level;
+    leveled_up := levels_gained > 0;
+    RETURN NEXT;
+END;
+$$;
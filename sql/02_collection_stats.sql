@@ -0,0 +1,90 @@
+-- Per-player collection counters, kept up to date by a trigger on user_cards
+-- so profile and achievement checks are a single primary-key lookup.
+CREATE TABLE IF NOT EXISTS player_collection_stats (
+    player_id      INT PRIMARY KEY,
+    distinct_cards INT NOT NULL DEFAULT 0,
+    base_cards     INT NOT NULL DEFAULT 0,
+    awakened_cards INT NOT NULL DEFAULT 0,
+    event_cards    INT NOT NULL DEFAULT 0,
+    total_quantity BIGINT NOT NULL DEFAULT 0,
+    has_awakened   BOOLEAN GENERATED ALWAYS AS (awakened_cards > 0) STORED
+);
+
+CREATE OR REPLACE FUNCTION bump_collection_stats(
+    p_user INT, p_card INT, p_distinct INT, p_quantity BIGINT
+) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_form TEXT;
+BEGIN
+    IF p_distinct = 0 AND p_quantity = 0 THEN
+        RETURN;
+    END IF;
+    SELECT c.form::text INTO v_form FROM cards c WHERE c.id = p_card;
+
+    INSERT INTO player_collection_stats AS s
+        (player_id, distinct_cards, base_cards, awakened_cards, event_cards, total_quantity)
+    VALUES (
+        p_user,
+        p_distinct,
+        CASE WHEN v_form = 'base' THEN p_distinct ELSE 0 END,
+        CASE WHEN v_form = 'awakened' THEN p_distinct ELSE 0 END,
+        CASE WHEN v_form = 'event' THEN p_distinct ELSE 0 END,
+        p_quantity
+    )
+    ON CONFLICT (player_id) DO UPDATE SET
+        distinct_cards = s.distinct_cards + EXCLUDED.distinct_cards,
+        base_cards     = s.base_cards + EXCLUDED.base_cards,
+        awakened_cards = s.awakened_cards + EXCLUDED.awakened_cards,
+        event_cards    = s.event_cards + EXCLUDED.event_cards,
+        total_quantity = s.total_quantity + EXCLUDED.total_quantity;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION track_collection_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_collection_stats(NEW.user_id, NEW.card_id, 1, COALESCE(NEW.quantity, 1));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_collection_stats(OLD.user_id, OLD.card_id, -1, -COALESCE(OLD.quantity, 1));
+    ELSIF NEW.user_id IS DISTINCT FROM OLD.user_id OR NEW.card_id IS DISTINCT FROM OLD.card_id THEN
+        PERFORM bump_collection_stats(OLD.user_id, OLD.card_id, -1, -COALESCE(OLD.quantity, 1));
+        PERFORM bump_collection_stats(NEW.user_id, NEW.card_id, 1, COALESCE(NEW.quantity, 1));
+    ELSE
+        PERFORM bump_collection_stats(NEW.user_id, NEW.card_id, 0,
+                                      COALESCE(NEW.quantity, 1) - COALESCE(OLD.quantity, 1));
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Full recount, for the first install or to recover from drift.
+CREATE OR REPLACE FUNCTION rebuild_collection_stats() RETURNS void
+LANGUAGE sql AS $$
+    DELETE FROM player_collection_stats;
+    INSERT INTO player_collection_stats
+        (player_id, distinct_cards, base_cards, awakened_cards, event_cards, total_quantity)
+    SELECT uc.user_id,
+           COUNT(*),
+           COUNT(*) FILTER (WHERE c.form = 'base'),
+           COUNT(*) FILTER (WHERE c.form = 'awakened'),
+           COUNT(*) FILTER (WHERE c.form = 'event'),
+           COALESCE(SUM(COALESCE(uc.quantity, 1)), 0)
+    FROM user_cards uc
+    JOIN cards c ON c.id = uc.card_id
+    GROUP BY uc.user_id;
+$$;
+
+DROP TRIGGER IF EXISTS user_cards_collection_stats ON user_cards;
+CREATE TRIGGER user_cards_collection_stats
+AFTER INSERT OR DELETE OR UPDATE OF user_id, card_id, quantity ON user_cards
+FOR EACH ROW EXECUTE FUNCTION track_collection_stats();
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM player_collection_stats) THEN
+        PERFORM rebuild_collection_stats();
+    END IF;
+END;
+$$;
@@ -0,0 +1,6 @@
+-- Batches already applied by the write-behind flusher (utils/write_behind.py).
+-- Replaying a batch after a crash is a no-op once its id is recorded here.
+CREATE TABLE IF NOT EXISTS write_behind_batches (
+    batch_id   TEXT PRIMARY KEY,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
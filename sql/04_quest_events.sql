@@ -0,0 +1,27 @@
+-- Which game event advances each quest template (see utils/quests.py).
+-- Templates without an event are never advanced automatically.
+-- The column is added and the existing templates tagged from their wording in
+-- the same step, only on the boot that creates it: templates an admin leaves
+-- untagged later stay NULL.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+          AND table_name = 'quest_templates' AND column_name = 'event'
+    ) THEN
+        ALTER TABLE quest_templates ADD COLUMN event TEXT;
+
+        UPDATE quest_templates
+        SET event = CASE
+            WHEN description ILIKE '%daily%' THEN 'daily'
+            WHEN description ILIKE '%summon%' THEN 'summon'
+            WHEN description ILIKE '%level%' THEN 'level_up'
+            WHEN description ILIKE '%warp%' OR description ILIKE '%claim%' THEN 'warp_claim'
+        END;
+    END IF;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS user_quests_open_idx
+    ON user_quests (user_id, quest_id) WHERE claimed = FALSE;
@@ -0,0 +1,2 @@
+-- teamset resolves codes case-insensitively: lower(c.code) = ANY($codes)
+CREATE INDEX IF NOT EXISTS cards_code_lower_idx ON cards (lower(code));
@@ -0,0 +1,99 @@
+-- Precomputed power rating per team, used by matchmaking (utils/matchmaking.py).
+-- Kept up to date by triggers on player_team and on user_cards stat changes.
+-- power = sqrt(total health * total attack weighted by speed), rounded.
+CREATE TABLE IF NOT EXISTS team_power (
+    player_id  INT PRIMARY KEY,
+    power      INT NOT NULL,
+    slots      INT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS team_power_power_idx ON team_power (power);
+
+-- Same fallback stats as FORM_BASE_STATS in cogs/entities.py.
+CREATE OR REPLACE FUNCTION compute_team_power(p_user INT) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_slots INT;
+    v_health NUMERIC;
+    v_offense NUMERIC;
+BEGIN
+    SELECT COUNT(*),
+           SUM(COALESCE(uc.health, CASE c.form WHEN 'awakened' THEN 150 WHEN 'event' THEN 120 ELSE 100 END)),
+           SUM(COALESCE(uc.attack, CASE c.form WHEN 'awakened' THEN 20 WHEN 'event' THEN 15 ELSE 10 END)
+               * (1 + COALESCE(uc.speed, CASE c.form WHEN 'awakened' THEN 15 WHEN 'event' THEN 20 ELSE 10 END) / 100.0))
+      INTO v_slots, v_health, v_offense
+      FROM player_team pt
+      JOIN user_cards uc ON uc.user_id = pt.user_id AND uc.card_id = pt.card_id
+      JOIN cards c ON c.id = pt.card_id
+     WHERE pt.user_id = p_user;
+
+    IF v_slots = 0 THEN
+        DELETE FROM team_power WHERE player_id = p_user;
+        RETURN;
+    END IF;
+
+    INSERT INTO team_power AS tp (player_id, power, slots, updated_at)
+    VALUES (p_user, round(sqrt(v_health * v_offense)), v_slots, now())
+    ON CONFLICT (player_id) DO UPDATE SET
+        power = EXCLUDED.power, slots = EXCLUDED.slots, updated_at = EXCLUDED.updated_at;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION track_team_power_slots() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM compute_team_power(OLD.user_id);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.user_id IS DISTINCT FROM OLD.user_id) THEN
+        PERFORM compute_team_power(NEW.user_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION track_team_power_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM player_team pt WHERE pt.user_id = NEW.user_id AND pt.card_id = NEW.card_id) THEN
+        PERFORM compute_team_power(NEW.user_id);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Full recount, for the first install or to recover from drift.
+CREATE OR REPLACE FUNCTION rebuild_team_power() RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    v_user INT;
+BEGIN
+    DELETE FROM team_power;
+    FOR v_user IN SELECT DISTINCT user_id FROM player_team LOOP
+        PERFORM compute_team_power(v_user);
+    END LOOP;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS player_team_power ON player_team;
+CREATE TRIGGER player_team_power
+AFTER INSERT OR DELETE OR UPDATE ON player_team
+FOR EACH ROW EXECUTE FUNCTION track_team_power_slots();
+
+DROP TRIGGER IF EXISTS user_cards_team_power ON user_cards;
+CREATE TRIGGER user_cards_team_power
+AFTER UPDATE OF health, attack, speed ON user_cards
+FOR EACH ROW
+WHEN (OLD.health IS DISTINCT FROM NEW.health
+   OR OLD.attack IS DISTINCT FROM NEW.attack
+   OR OLD.speed IS DISTINCT FROM NEW.speed)
+EXECUTE FUNCTION track_team_power_stats();
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM team_power) THEN
+        PERFORM rebuild_team_power();
+    END IF;
+END;
+$$;
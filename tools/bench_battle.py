@@ -0,0 +1,106 @@
+# tools/bench_battle.py
+"""
+Throughput benchmark for the batch battle engine (utils/battle.py).
+
+Builds random teams, then resolves the same matchups with:
+  - a reference object-per-turn loop on cogs.entities.Entity
+  - utils.battle.simulate, all fights in one vectorized pass
+checks that both agree, and reports fights per second.
+
+Usage:
+    python -m tools.bench_battle --fights 10000 --slots 5
+    python -m tools.bench_battle --fights 100000 --skip-reference
+"""
+import argparse
+import time
+
+import numpy as np
+
+from cogs.entities import Entity
+from rng import make_generator
+from utils.battle import DEFAULT_MAX_ROUNDS, DRAW, pack_entities, simulate
+
+
+def make_teams(count: int, slots: int, seed=None) -> list[list[Entity]]:
+    gen = make_generator(seed)
+    health = gen.integers(80, 200, size=(count, slots))
+    attack = gen.integers(8, 30, size=(count, slots))
+    speed = gen.integers(5, 25, size=(count, slots))
+    sizes = gen.integers(1, slots + 1, size=count)
+    return [
+        [
+            Entity(f"Unit {t}-{s}", override_stats={
+                "health": int(health[t, s]), "attack": int(attack[t, s]), "speed": int(speed[t, s])
+            })
+            for s in range(sizes[t])
+        ]
+        for t in range(count)
+    ]
+
+def reference_fight(team_a: list[Entity], team_b: list[Entity], max_rounds: int) -> int:
+    """Object-per-turn loop with the engine's rules; mutates the entities."""
+    sides = (team_a, team_b)
+    units = [(0, s, e) for s, e in enumerate(team_a)] + [(1, s, e) for s, e in enumerate(team_b)]
+    units.sort(key=lambda u: -u[2].stats.speed)  # stable: side 0 then slot order on ties
+    start = [sum(e.stats.health for e in team) for team in sides]
+
+    for _ in range(max_rounds):
+        for side, _, unit in units:
+            if not unit.is_alive():
+                continue
+            enemies = [e for e in sides[1 - side] if e.is_alive()]
+            if not enemies:
+                break
+            unit.attack_target(enemies[0])
+        left = [sum(e.stats.health for e in team) for team in sides]
+        if not left[0] or not left[1]:
+            break
+
+    left = [sum(e.stats.health for e in team) for team in sides]
+    if not left[0] and left[1]:
+        return 1
+    if not left[1] and left[0]:
+        return 0
+    if not left[0] and not left[1]:
+        return DRAW
+    a, b = left[0] * start[1], left[1] * start[0]
+    return 0 if a > b else 1 if b > a else DRAW
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch battle engine benchmark")
+    parser.add_argument("--fights", type=int, default=10_000)
+    parser.add_argument("--slots", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=DEFAULT_MAX_ROUNDS, help="max rounds per fight")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skip-reference", action="store_true", help="only time the vectorized engine")
+    args = parser.parse_args()
+
+    teams_a = make_teams(args.fights, args.slots, args.seed)
+    teams_b = make_teams(args.fights, args.slots, args.seed + 1)
+
+    started = time.perf_counter()
+    side_a, side_b = pack_entities(teams_a, args.slots), pack_entities(teams_b, args.slots)
+    packed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    result = simulate(side_a, side_b, max_rounds=args.rounds)
+    elapsed = time.perf_counter() - started
+    outcomes = np.bincount(result.winner + 1, minlength=3)
+    print(f"⚔️ {args.fights:,} fights, up to {args.slots} slots per team")
+    print(f"  pack                {packed * 1000:>9.1f} ms")
+    print(f"  vectorized engine   {elapsed * 1000:>9.1f} ms   {args.fights / elapsed:>12,.0f} fights/s")
+    print(f"  outcomes            side 0: {outcomes[1]:,}  side 1: {outcomes[2]:,}  draws: {outcomes[0]:,}")
+    print(f"  rounds              mean {result.rounds.mean():.1f}, max {result.rounds.max()}")
+
+    if args.skip_reference:
+        return
+
+    started = time.perf_counter()
+    expected = [reference_fight(a, b, args.rounds) for a, b in zip(teams_a, teams_b)]
+    ref_elapsed = time.perf_counter() - started
+    mismatches = int((np.asarray(expected) != result.winner).sum())
+    print(f"  Entity loop         {ref_elapsed * 1000:>9.1f} ms   {args.fights / ref_elapsed:>12,.0f} fights/s")
+    print(f"  → x{ref_elapsed / elapsed:.1f} faster, {mismatches} mismatching outcome(s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# tools/bench_records.py
+"""
+Memory / construction-time benchmark for the slotted record types.
+
+Compares, on a synthetic N-card inventory:
+  - SQLAlchemy `Card` ORM instances vs `CardRecord`
+  - dict rows vs `UserCardRecord`
+  - dict-backed vs slotted `Entity` + `Stats`, both built by entity_from_db
+
+Usage:
+    python -m tools.bench_records --cards 10000
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from cogs import entities
+from cogs.entities import Entity, Stats, entity_from_db
+from models.card import Card
+from models.records import CardRecord, UserCardRecord
+
+FORMS = ("base", "awakened", "event")
+
+
+class DictStats:
+    """Pre-slots Stats: same constructor, attributes stored in a per-instance __dict__."""
+    __init__ = Stats.__init__
+
+class DictEntity:
+    """Pre-slots Entity: same constructor, attributes stored in a per-instance __dict__."""
+    __init__ = Entity.__init__
+
+
+def make_rows(n: int) -> list[dict]:
+    return [
+        {
+            "id": i, "card_id": i, "character_name": f"Character {i}", "form": FORMS[i % 3],
+            "image_url": f"https://cdn.example.com/cards/{i}.png", "series": f"Series {i % 50}",
+            "code": f"{i:04x}", "description": None, "approved": True,
+            "quantity": 1 + i % 4, "xp": (i * 37) % 1000,
+            "health": 100 + i % 20, "attack": 10 + i % 7, "speed": 10 + i % 5,
+        }
+        for i in range(n)
+    ]
+
+def measure(label: str, build, rows: list[dict]):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    objects = build(rows)
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_obj = current / len(objects)
+    print(f"  {label:<28} {elapsed * 1000:>8.1f} ms   {current / 1024:>9.0f} KiB   {per_obj:>6.0f} B/obj")
+    del objects
+    return elapsed, current
+
+def build_orm(rows):
+    return [
+        Card(id=r["id"], character_name=r["character_name"], form=r["form"], image_url=r["image_url"],
+             series=r["series"], code=r["code"])
+        for r in rows
+    ]
+
+def build_card_records(rows):
+    return [CardRecord.from_row(r) for r in rows]
+
+def build_dict_rows(rows):
+    return [{k: r[k] for k in UserCardRecord._fields} for r in rows]
+
+def build_user_card_records(rows):
+    return [UserCardRecord.from_row(r) for r in rows]
+
+def build_dict_entities(rows):
+    # same factory, pointed at the __dict__-backed classes
+    entities.Entity, entities.Stats = DictEntity, DictStats
+    try:
+        return [entity_from_db(r, r) for r in rows]
+    finally:
+        entities.Entity, entities.Stats = Entity, Stats
+
+def build_entities(rows):
+    return [entity_from_db(r, r) for r in rows]
+
+def main():
+    parser = argparse.ArgumentParser(description="Slotted record benchmark")
+    parser.add_argument("--cards", type=int, default=10_000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.cards)
+    print(f"📦 {args.cards:,} cards{'':<14}      time        memory     per object")
+
+    pairs = [
+        ("Card (SQLAlchemy ORM)", build_orm, "CardRecord", build_card_records),
+        ("dict row", build_dict_rows, "UserCardRecord", build_user_card_records),
+        ("Entity with __dict__", build_dict_entities, "Entity (slotted)", build_entities),
+    ]
+    for old_label, old_build, new_label, new_build in pairs:
+        old_time, old_mem = measure(old_label, old_build, rows)
+        new_time, new_mem = measure(new_label, new_build, rows)
+        print(f"  → time x{new_time / old_time:.2f}, memory x{new_mem / old_mem:.2f}\n")
+
+if __name__ == "__main__":
+    main()
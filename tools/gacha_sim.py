@@ -0,0 +1,130 @@
+# tools/gacha_sim.py
+"""
+Monte Carlo simulator for the Warp Lake gacha.
+
+Runs the exact roll code used by WarpLakeView (utils.gacha_rolls.roll_pulls_batch)
+over many simulated players and reports observed rates, pity/guarantee
+trigger frequency and per-player key cost. Also serves as a throughput
+benchmark for the roll code.
+
+Usage:
+    python -m tools.gacha_sim --players 100000 --sessions 100 --count 10
+    python -m tools.gacha_sim --bench --count 10
+"""
+import argparse
+import time
+
+import numpy as np
+
+from utils.gacha_rolls import EVENT_PITY, PULL_RATES, PULL_TABLE, FORM_INDEX, roll_pulls_batch
+from rng import make_generator
+
+PERCENTILES = (50, 90, 99)
+
+
+def simulate(players: int, sessions: int, count: int, seed=None) -> dict:
+    """
+    Each simulated player does `sessions` summons of `count` keys, carrying
+    their pity counter from one summon to the next exactly like players.pulls.
+    """
+    gen = make_generator(seed)
+    pulls_before = np.zeros(players, dtype=np.int64)
+    form_counts = np.zeros(len(PULL_TABLE.items), dtype=np.int64)
+    pity_hits = 0
+    guarantee_hits = 0
+
+    never = np.iinfo(np.int64).max
+    first_event = np.full(players, never, dtype=np.int64)
+    first_awakened = np.full(players, never, dtype=np.int64)
+    events_per_player = np.zeros(players, dtype=np.int64)
+
+    started = time.perf_counter()
+    for session in range(sessions):
+        forms, pity, guarantee = roll_pulls_batch(count, pulls_before, gen, return_triggers=True)
+
+        form_counts += np.bincount(forms.ravel(), minlength=len(form_counts))
+        pity_hits += int(pity.sum())
+        guarantee_hits += int(guarantee.sum())
+
+        is_event = forms == FORM_INDEX["event"]
+        is_awakened = forms == FORM_INDEX["awakened"]
+        events_per_player += is_event.sum(axis=1)
+
+        # coût en clés jusqu'au premier event / awakened (position 1-based dans la session)
+        keys_spent = session * count
+        has_event = is_event.any(axis=1) & (first_event == never)
+        first_event[has_event] = keys_spent + is_event[has_event].argmax(axis=1) + 1
+        has_awakened = is_awakened.any(axis=1) & (first_awakened == never)
+        first_awakened[has_awakened] = keys_spent + is_awakened[has_awakened].argmax(axis=1) + 1
+
+        pulls_before = np.where(pulls_before + count >= EVENT_PITY, 0, pulls_before + count)
+    elapsed = time.perf_counter() - started
+
+    total = players * sessions * count
+    return {
+        "pulls": total,
+        "elapsed": elapsed,
+        "rates": {form: form_counts[i] / total for form, i in FORM_INDEX.items()},
+        "pity_rate": pity_hits / (players * sessions),
+        "guarantee_rate": guarantee_hits / (players * sessions),
+        "first_event": first_event[first_event != never],
+        "first_awakened": first_awakened[first_awakened != never],
+        "no_event": int((first_event == never).sum()),
+        "events_per_player": events_per_player,
+        "keys_per_player": sessions * count,
+    }
+
+def benchmark(count: int, batch: int, rounds: int, seed=None) -> float:
+    """Returns pulls/second for roll_pulls_batch on `batch` players per call."""
+    gen = make_generator(seed)
+    pulls_before = gen.integers(0, EVENT_PITY, size=batch)
+    roll_pulls_batch(count, pulls_before, gen)  # warm-up
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        roll_pulls_batch(count, pulls_before, gen)
+    elapsed = time.perf_counter() - started
+    return batch * count * rounds / elapsed
+
+def _percentiles(values: np.ndarray) -> str:
+    if values.size == 0:
+        return "n/a"
+    return " | ".join(f"p{p}: {np.percentile(values, p):,.0f}" for p in PERCENTILES)
+
+def report(result: dict, count: int):
+    print(f"🎲 {result['pulls']:,} pulls in {result['elapsed']:.2f}s "
+          f"({result['pulls'] / result['elapsed']:,.0f} pulls/s)")
+    print("\n📊 Observed rates (configured → observed)")
+    for form, rate in result["rates"].items():
+        print(f"  {form:<9} {PULL_RATES[form]:>8.3%} → {rate:>8.3%}")
+
+    print("\n🛡️ Triggers per summon")
+    print(f"  {EVENT_PITY}-pull event pity: {result['pity_rate']:.3%}")
+    if count == 10:
+        print(f"  10-pull awakened guarantee: {result['guarantee_rate']:.3%}")
+
+    print(f"\n💸 Cost per player ({result['keys_per_player']:,} keys each)")
+    print(f"  keys to first event:    {_percentiles(result['first_event'])}")
+    print(f"  keys to first awakened: {_percentiles(result['first_awakened'])}")
+    print(f"  players with no event:  {result['no_event']:,}")
+    print(f"  events per player:      {_percentiles(result['events_per_player'])}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Warp Lake gacha Monte Carlo simulator")
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--sessions", type=int, default=20, help="summons per player")
+    parser.add_argument("--count", type=int, default=10, choices=(1, 10), help="keys per summon")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--bench", action="store_true", help="only measure roll throughput")
+    parser.add_argument("--rounds", type=int, default=20, help="benchmark rounds")
+    args = parser.parse_args()
+
+    if args.bench:
+        rate = benchmark(args.count, args.players, args.rounds, args.seed)
+        print(f"⚡ roll_pulls_batch(count={args.count}, batch={args.players:,}): {rate:,.0f} pulls/s")
+        return
+
+    report(simulate(args.players, args.sessions, args.count, args.seed), args.count)
+
+if __name__ == "__main__":
+    main()
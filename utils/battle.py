@@ -0,0 +1,203 @@
+# utils/battle.py
+"""
+Batch battle engine.
+
+Teams are packed into struct-of-arrays form (one NumPy array per stat, one
+row per team, one column per slot) and any number of fights are resolved
+together: every step of the turn loop is a handful of array operations over
+all fights at once, so a tournament costs about the same Python overhead as
+a single fight.
+
+Rules (same as Entity.attack_target):
+  - each round, every living unit acts once, fastest first; ties go to the
+    challenger (side 0), then to the lower slot
+  - a unit hits the first living enemy slot for its full attack
+  - a side with no living unit loses; after `max_rounds` the side with the
+    larger share of its starting health left wins, equal shares are a draw
+
+Usage:
+    a = pack_rosters([roster_1, roster_2])
+    b = pack_rosters([roster_3, roster_4])
+    result = simulate(a, b)                # fight i = a[i] vs b[i]
+    result = simulate(a, b, log=[0])       # turn log for fight 0 only
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from cogs.entities import FORM_BASE_STATS
+
+DRAW = -1
+DEFAULT_MAX_ROUNDS = 50
+
+# log entry of one hit
+Turn = namedtuple("Turn", ("round", "side", "slot", "target_slot", "damage", "target_health"))
+
+
+class TeamArrays(namedtuple("TeamArrays", ("health", "attack", "speed"))):
+    """(teams, slots) int64 stat arrays; empty slots have 0 health and never act."""
+    __slots__ = ()
+
+    def __len__(self):
+        return self.health.shape[0]
+
+    @property
+    def slots(self) -> int:
+        return self.health.shape[1]
+
+    def take(self, index) -> "TeamArrays":
+        """Rows `index` (e.g. the challengers of each matchup) as a new TeamArrays."""
+        return TeamArrays(self.health[index], self.attack[index], self.speed[index])
+
+    def padded(self, slots: int) -> "TeamArrays":
+        extra = slots - self.slots
+        if extra <= 0:
+            return self
+        pad = ((0, 0), (0, extra))
+        return TeamArrays(*(np.pad(a, pad) for a in self))
+
+
+BattleResult = namedtuple("BattleResult", ("winner", "rounds", "health_left", "logs"))
+BattleResult.__doc__ = """
+winner: (fights,) 0 / 1 for the winning side, DRAW otherwise
+rounds: (fights,) rounds played
+health_left: (fights, 2) total health left per side
+logs: {fight index: [Turn, ...]} for the fights that were logged, else None
+"""
+
+
+def _stat(row, name: str):
+    value = row.get(name)
+    if value is None:
+        value = FORM_BASE_STATS.get((row.get("form") or "base").lower(), FORM_BASE_STATS["base"])[name]
+    return value
+
+def pack_rosters(rosters, slots: int = None) -> TeamArrays:
+    """
+    Packs team rosters (lists of TeamSlotRecord / player_team rows, in slot
+    order) into TeamArrays. Missing user_cards stats fall back to the form's
+    base stats, like entity_from_db.
+    """
+    slots = slots or max((len(r) for r in rosters), default=1) or 1
+    shape = (len(rosters), slots)
+    health = np.zeros(shape, dtype=np.int64)
+    attack = np.zeros(shape, dtype=np.int64)
+    speed = np.zeros(shape, dtype=np.int64)
+    for t, roster in enumerate(rosters):
+        for s, row in enumerate(roster[:slots]):
+            health[t, s] = _stat(row, "health")
+            attack[t, s] = _stat(row, "attack")
+            speed[t, s] = _stat(row, "speed")
+    return TeamArrays(health, attack, speed)
+
+def pack_entities(teams, slots: int = None) -> TeamArrays:
+    """Same as pack_rosters for lists of cogs.entities.Entity."""
+    return pack_rosters(
+        [[{"health": e.stats.health, "attack": e.stats.attack, "speed": e.stats.speed} for e in team]
+         for team in teams],
+        slots
+    )
+
+
+def simulate(side_a: TeamArrays, side_b: TeamArrays, max_rounds: int = DEFAULT_MAX_ROUNDS,
+             log=None) -> BattleResult:
+    """
+    Resolves len(side_a) fights, fight i being side_a[i] vs side_b[i].
+    `log`: None/False for no logs, True to log every fight, or an iterable of
+    fight indices to log only those.
+    """
+    if len(side_a) != len(side_b):
+        raise ValueError("side_a and side_b must hold the same number of teams")
+
+    slots = max(side_a.slots, side_b.slots)
+    side_a, side_b = side_a.padded(slots), side_b.padded(slots)
+    fights = len(side_a)
+    units = 2 * slots
+
+    # units 0..slots-1 are side 0, slots..2*slots-1 side 1
+    health = np.concatenate([side_a.health, side_b.health], axis=1)
+    attack = np.concatenate([side_a.attack, side_b.attack], axis=1)
+    speed = np.concatenate([side_a.speed, side_b.speed], axis=1)
+    start_health = health.reshape(fights, 2, slots).sum(axis=2)
+
+    # speeds never change during a fight: the turn order is computed once
+    order = np.argsort(-speed, axis=1, kind="stable")
+    rows = np.arange(fights)
+
+    if log is True:
+        logged = rows
+    elif log:
+        logged = np.unique(np.fromiter(log, dtype=np.int64))
+    else:
+        logged = None
+    log_mask = np.zeros(fights, dtype=bool)
+    if logged is not None:
+        log_mask[logged] = True
+    entries = []
+
+    alive = (health > 0).reshape(fights, 2, slots)
+    done = ~alive[:, 0].any(axis=1) | ~alive[:, 1].any(axis=1)
+    rounds = np.zeros(fights, dtype=np.int64)
+
+    for rnd in range(1, max_rounds + 1):
+        # only fights still running are carried through the round
+        live = np.flatnonzero(~done)
+        if not live.size:
+            break
+        rounds[live] = rnd
+        h, atk, al, ordr = health[live], attack[live], alive[live], order[live]
+        d = np.zeros(live.size, dtype=bool)
+        r = np.arange(live.size)
+        logging_live = log_mask[live] if logged is not None else None
+
+        for k in range(units):
+            actor = ordr[:, k]
+            acting = ~d & (h[r, actor] > 0)
+            if not acting.any():
+                continue
+
+            enemy_side = 1 - actor // slots
+            target_slot = al[r, enemy_side].argmax(axis=1)
+            target = enemy_side * slots + target_slot
+
+            damage = atk[r, actor] * acting
+            h[r, target] = np.maximum(h[r, target] - damage, 0)
+            al[r, enemy_side, target_slot] = h[r, target] > 0
+            d |= ~al[r, enemy_side].any(axis=1)
+
+            if logged is not None:
+                hit = np.flatnonzero(acting & logging_live)
+                if hit.size:
+                    entries.append((rnd, live[hit], actor[hit], target[hit], damage[hit], h[hit, target[hit]]))
+
+        health[live], alive[live] = h, al
+        done[live] = d
+
+    health_left = health.reshape(fights, 2, slots).sum(axis=2)
+    winner = np.full(fights, DRAW, dtype=np.int64)
+    wiped = health_left == 0
+    winner[wiped[:, 1] & ~wiped[:, 0]] = 0
+    winner[wiped[:, 0] & ~wiped[:, 1]] = 1
+
+    # timeouts: compare the share of starting health each side kept
+    undecided = ~wiped.any(axis=1)
+    if undecided.any():
+        share = health_left[undecided] * start_health[undecided][:, ::-1]  # cross-multiplied ratios
+        idx = np.flatnonzero(undecided)
+        winner[idx[share[:, 0] > share[:, 1]]] = 0
+        winner[idx[share[:, 1] > share[:, 0]]] = 1
+
+    logs = None
+    if logged is not None:
+        logs = {int(i): [] for i in logged}
+        for rnd, hit, actors, targets, damage, left in entries:
+            for f, a, t, dmg, hp in zip(hit.tolist(), actors.tolist(), targets.tolist(), damage.tolist(), left.tolist()):
+                logs[f].append(Turn(rnd, a // slots, a % slots, t % slots, dmg, hp))
+
+    return BattleResult(winner, rounds, health_left, logs)
+
+
+def simulate_one(team_a, team_b, max_rounds: int = DEFAULT_MAX_ROUNDS, log: bool = False):
+    """Single fight between two rosters; returns (winner, rounds, turns or None)."""
+    result = simulate(pack_rosters([team_a]), pack_rosters([team_b]), max_rounds, log=[0] if log else None)
+    return int(result.winner[0]), int(result.rounds[0]), result.logs[0] if log else None
@@ -0,0 +1,84 @@
+# utils/catalog.py
+import asyncio
+import logging
+import random
+
+from models.records import CardRecord
+
+log = logging.getLogger(__name__)
+
+FORMS = ("base", "awakened", "event")
+
+
+class CardCatalog:
+    """
+    In-memory copy of the `cards` table, indexed by form and approval.
+    Random draws are O(k) list picks instead of `ORDER BY random()` scans.
+    Usage:
+    catalog = await CardCatalog(bot.db).load()
+    card1, card2 = catalog.sample("base", 2, approved=True)
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._by_id: dict[int, CardRecord] = {}
+        self._by_form: dict[tuple[str, bool], list[CardRecord]] = {}
+        self._refresh_task: asyncio.Task | None = None
+
+    async def load(self):
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT id, character_name, form, image_url, series, code, description, approved
+                FROM cards
+            """)
+
+        by_id = {}
+        by_form = {(form, approved): [] for form in FORMS for approved in (False, True)}
+        for row in rows:
+            card = CardRecord.from_row(row)
+            by_id[card.id] = card
+            by_form.setdefault((card.form, False), []).append(card)
+            if card.approved:
+                by_form.setdefault((card.form, True), []).append(card)
+
+        # swap atomique: les lecteurs voient l'ancien ou le nouveau catalogue, jamais un mélange
+        self._by_id, self._by_form = by_id, by_form
+        log.info(f"🃏 Card catalog loaded: {len(by_id)} card(s)")
+        return self
+
+    def start(self, interval: float):
+        """Reloads the catalog every `interval` seconds in the background."""
+        async def _loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.load()
+                except Exception as e:
+                    log.error(f"❌ Card catalog refresh failed: {e!r}")
+
+        if interval > 0 and self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(_loop())
+        return self
+
+    def stop(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def get(self, card_id: int) -> CardRecord | None:
+        return self._by_id.get(card_id)
+
+    def cards(self, form: str, approved: bool = False) -> list[CardRecord]:
+        return self._by_form.get((form, approved), [])
+
+    def pick(self, form: str, approved: bool = False) -> CardRecord | None:
+        pool = self.cards(form, approved)
+        return random.choice(pool) if pool else None
+
+    def sample(self, form: str, k: int, approved: bool = False) -> list[CardRecord]:
+        """Up to `k` distinct random cards of the given form."""
+        pool = self.cards(form, approved)
+        return random.sample(pool, min(k, len(pool)))
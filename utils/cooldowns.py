@@ -0,0 +1,47 @@
+# utils/cooldowns.py
+import time
+
+# SET NX EX puis GET dans le même script: aucune fenêtre entre le test et la lecture
+_ACQUIRE = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return 0
+end
+return tonumber(redis.call('GET', KEYS[1]))
+"""
+
+
+class CooldownStore:
+    """
+    Redis-backed cooldowns shared by every bot process.
+    Each cooldown is one key `cd:<action>:<discord_id>` holding the ready-at
+    timestamp, with a TTL so Redis drops it as soon as it expires.
+    Usage:
+    ok, ready_at = await bot.cooldowns.acquire("warp", discord_id, 600)
+    """
+
+    def __init__(self, redis, prefix: str = "cd"):
+        self.redis = redis
+        self.prefix = prefix
+        self._acquire = redis.register_script(_ACQUIRE)
+
+    def key(self, action: str, discord_id: str) -> str:
+        return f"{self.prefix}:{action}:{discord_id}"
+
+    async def acquire(self, action: str, discord_id: str, seconds: int) -> tuple[bool, int]:
+        """
+        Starts the cooldown if it isn't running.
+        Returns (True, new ready_at) on success, (False, current ready_at) otherwise.
+        """
+        seconds = max(1, int(seconds))
+        ready_at = int(time.time()) + seconds
+        current = await self._acquire(keys=[self.key(action, discord_id)], args=[ready_at, seconds])
+        if not current:
+            return True, ready_at
+        return False, int(current)
+
+    async def ready_at(self, action: str, discord_id: str) -> int | None:
+        value = await self.redis.get(self.key(action, discord_id))
+        return int(value) if value else None
+
+    async def reset(self, action: str, discord_id: str):
+        await self.redis.delete(self.key(action, discord_id))
@@ -0,0 +1,94 @@
+# utils/daily_claims.py
+import datetime
+
+
+def utc_today() -> datetime.date:
+    return datetime.datetime.now(datetime.timezone.utc).date()
+
+
+class DailyClaims:
+    """
+    Daily-claim state as one Redis bitmap per UTC day (`daily:claims:<YYYYMMDD>`),
+    bit offset = players.id. Claiming is a single SETBIT, a day costs about one
+    bit per player, and BITCOUNT/BITOP give active-player and streak numbers
+    without touching Postgres.
+    Usage:
+    if await bot.daily_claims.claim(player_id): ...
+    dau = await bot.daily_claims.active_count()
+    """
+
+    def __init__(self, redis, retention_days: int = 90, prefix: str = "daily:claims"):
+        self.redis = redis
+        self.retention_days = retention_days
+        self.prefix = prefix
+
+    def key(self, day: datetime.date) -> str:
+        return f"{self.prefix}:{day:%Y%m%d}"
+
+    def _days(self, days: int, end: datetime.date = None) -> list[datetime.date]:
+        end = end or utc_today()
+        return [end - datetime.timedelta(days=i) for i in range(days)]
+
+    async def claim(self, player_id: int, day: datetime.date = None) -> bool:
+        """Marks the claim; True if the player hadn't claimed that day yet."""
+        key = self.key(day or utc_today())
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.setbit(key, player_id, 1)
+            pipe.expire(key, self.retention_days * 86400)
+            previous, _ = await pipe.execute()
+        return previous == 0
+
+    async def unclaim(self, player_id: int, day: datetime.date = None):
+        """Rolls a claim back (the reward transaction failed)."""
+        await self.redis.setbit(self.key(day or utc_today()), player_id, 0)
+
+    async def has_claimed(self, player_id: int, day: datetime.date = None) -> bool:
+        return bool(await self.redis.getbit(self.key(day or utc_today()), player_id))
+
+    async def streak(self, player_id: int, max_days: int = 30) -> int:
+        """
+        Consecutive claimed days ending today, or yesterday if today isn't
+        claimed yet (the streak is still alive until the reset).
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for day in self._days(max_days):
+                pipe.getbit(self.key(day), player_id)
+            bits = await pipe.execute()
+        if bits and not bits[0]:
+            bits = bits[1:]
+        streak = 0
+        for bit in bits:
+            if not bit:
+                break
+            streak += 1
+        return streak
+
+    # --- Analytics ---
+    async def active_count(self, day: datetime.date = None) -> int:
+        return await self.redis.bitcount(self.key(day or utc_today()))
+
+    async def active_counts(self, days: int = 7) -> list[tuple[datetime.date, int]]:
+        """Claims per day for the last `days` days, most recent first."""
+        window = self._days(days)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for day in window:
+                pipe.bitcount(self.key(day))
+            counts = await pipe.execute()
+        return list(zip(window, counts))
+
+    async def _combine(self, op: str, days: int) -> int:
+        dest = f"{self.prefix}:tmp:{op.lower()}:{days}"
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.bitop(op, dest, *(self.key(day) for day in self._days(days)))
+            pipe.bitcount(dest)
+            pipe.delete(dest)
+            _, count, _ = await pipe.execute()
+        return count
+
+    async def unique_active(self, days: int = 7) -> int:
+        """Players who claimed at least once in the last `days` days (BITOP OR)."""
+        return await self._combine("OR", days)
+
+    async def streak_count(self, days: int = 7) -> int:
+        """Players who claimed on every one of the last `days` days (BITOP AND)."""
+        return await self._combine("AND", days)
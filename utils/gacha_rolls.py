@@ -0,0 +1,53 @@
+# utils/gacha_rolls.py
+"""
+Warp Lake roll rules, without any discord/config dependency so the
+offline simulator (tools/gacha_sim.py) can import them.
+"""
+import numpy as np
+
+from rng import AliasTable, make_generator
+
+PULL_RATES = {
+    "base": 0.90,
+    "awakened": 0.095,
+    "event": 0.005
+}
+
+# Compiled once: O(1) per roll, shared by every summon
+PULL_TABLE = AliasTable(list(PULL_RATES.items()))
+FORM_INDEX = {form: i for i, form in enumerate(PULL_TABLE.items)}
+
+EVENT_PITY = 50
+
+def roll_pulls_batch(count: int, pulls_before, seed=None, return_triggers: bool = False):
+    """
+    Vectorized roll for many players at once.
+    `pulls_before` holds each player's pity counter; returns an (n, count) array of
+    indices into PULL_TABLE.items. The last pull is forced to event when the pity is
+    reached, and a 10-pull without any awakened gets one at a random slot.
+    With `return_triggers`, also returns the (pity, awakened_guarantee) boolean masks.
+    """
+    gen = make_generator(seed)
+    pulls_before = np.asarray(pulls_before)
+    n = pulls_before.shape[0]
+
+    forms = PULL_TABLE.draw_indices((n, count), gen)
+
+    pity = pulls_before + count >= EVENT_PITY
+    forms[pity, -1] = FORM_INDEX["event"]
+
+    guarantee = np.zeros(n, dtype=bool)
+    if count == 10:
+        guarantee = ~(forms == FORM_INDEX["awakened"]).any(axis=1)
+        slots = gen.integers(0, 10, size=n)
+        rows = np.nonzero(guarantee)[0]
+        forms[rows, slots[rows]] = FORM_INDEX["awakened"]
+
+    if return_triggers:
+        return forms, pity, guarantee
+    return forms
+
+def roll_pulls(count: int, pulls_before: int, seed=None) -> list[str]:
+    """Rolls `count` forms for one player; same rules as roll_pulls_batch."""
+    row = roll_pulls_batch(count, [pulls_before], seed)[0]
+    return [PULL_TABLE.items[i] for i in row.tolist()]
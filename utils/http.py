@@ -0,0 +1,156 @@
+# utils/http.py
+import asyncio
+import logging
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+log = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a host is short-circuited after repeated failures."""
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker: after `threshold` consecutive failures the host is
+    skipped for `reset_after` seconds, then a single trial request is let
+    through (half-open) while the others keep being skipped until it
+    succeeds or fails. A trial that never reports back (cancelled) is
+    replaced after another `reset_after`.
+    """
+
+    def __init__(self, threshold: int = 3, reset_after: float = 30.0):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.half_open = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            # half-open: une seule requête d'essai, les autres attendent son résultat
+            self.half_open = True
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.half_open = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.half_open or self.failures >= self.threshold:
+            self.half_open = False
+            self.opened_at = time.monotonic()
+
+
+class ImageFetcher:
+    """
+    Shared, pooled HTTP client for card images.
+    Usage:
+    fetcher = ImageFetcher()
+    await fetcher.start()
+    data1, data2 = await fetcher.fetch_many(url1, url2)
+    """
+
+    def __init__(self, timeout: float = 5.0, per_host: int = 4, max_connections: int = 50,
+                 breaker_threshold: int = 3, breaker_reset: float = 30.0):
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.per_host = per_host
+        self.max_connections = max_connections
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset = breaker_reset
+        self._session: aiohttp.ClientSession | None = None
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    async def start(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.per_host,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+        return self
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        return self._session
+
+    def _breaker(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc.lower()
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(self.breaker_threshold, self.breaker_reset)
+        return breaker
+
+    async def fetch(self, url: str) -> bytes:
+        _, data, _ = await self.fetch_conditional(url)
+        return data
+
+    async def fetch_conditional(self, url: str, etag: str = None,
+                                last_modified: str = None) -> tuple[int, bytes | None, dict]:
+        """
+        GET with If-None-Match / If-Modified-Since.
+        Returns (status, body, validators); body is None on 304 Not Modified.
+        """
+        breaker = self._breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"circuit open for {urlsplit(url).netloc}")
+
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        try:
+            async with self._session.get(url, headers=headers) as resp:
+                if resp.status == 304:
+                    data = None
+                else:
+                    resp.raise_for_status()
+                    data = await resp.read()
+                status = resp.status
+                validators = {
+                    "etag": resp.headers.get("ETag") or etag,
+                    "last_modified": resp.headers.get("Last-Modified") or last_modified
+                }
+        except aiohttp.ClientResponseError as e:
+            # 4xx = cette URL (lien expiré, supprimé), pas l'hôte: seuls 5xx et 429 comptent
+            if 400 <= e.status < 500 and e.status != 429:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            breaker.record_failure()
+            raise
+
+        breaker.record_success()
+        return status, data, validators
+
+    async def fetch_many(self, *urls: str) -> list[bytes | None]:
+        """
+        Fetches all URLs concurrently. Failed downloads come back as None.
+        """
+        results = await asyncio.gather(*(self.fetch(url) for url in urls), return_exceptions=True)
+        out = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                log.warning(f"❌ Image fetch failed for {url}: {result!r}")
+                out.append(None)
+            else:
+                out.append(result)
+        return out
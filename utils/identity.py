@@ -0,0 +1,155 @@
+# utils/identity.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+import queries
+
+log = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Writes a looked-up id unless an invalidation landed while it was being read
+# from Postgres (its tombstone is still there); "" marks an unregistered user.
+_PUT = """
+if redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+
+class IdentityCache:
+    """
+    discord_id -> players.id resolution, cached in two tiers:
+    a bounded per-process LRU, then (optionally) Redis `ident:<discord_id>`
+    shared by every process. Unregistered users are cached too, for a shorter
+    `negative_ttl`, so spamming commands before `wregister` stays cheap.
+
+    `invalidate` (called by `register`) deletes the Redis entry, leaves a
+    short tombstone so a lookup already in flight can't write the old value
+    back, and publishes the id on `ident:invalidate` so every process drops it
+    from its LRU. Until that message is delivered (normally milliseconds),
+    another process may still answer from its LRU; without Redis, the window
+    is `negative_ttl`. Only the id is cached: ban state is read from Postgres.
+    Usage:
+    player_id = await bot.identity.player_id(discord_id)
+    """
+
+    def __init__(self, pool, redis=None, size: int = 10_000, ttl: float = 3600,
+                 negative_ttl: float = 30, shared_tier: bool = True, prefix: str = "ident",
+                 tombstone_ttl: int = 5):
+        self.pool = pool
+        self.redis = redis
+        self.shared_tier = bool(redis) and shared_tier
+        self.size = size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.prefix = prefix
+        self.tombstone_ttl = tombstone_ttl
+        self.channel = f"{prefix}:invalidate"
+        self._lru: OrderedDict[str, tuple[float, int | None]] = OrderedDict()
+        self._generation = 0  # bumped by every invalidation this process sees
+        self._put = redis.register_script(_PUT) if redis else None
+        self._task: asyncio.Task | None = None
+
+    def _key(self, discord_id: str) -> str:
+        return f"{self.prefix}:{discord_id}"
+
+    def _tombstone(self, discord_id: str) -> str:
+        return f"{self.prefix}:tomb:{discord_id}"
+
+    def _remember(self, discord_id: str, player_id: int | None):
+        ttl = self.ttl if player_id else self.negative_ttl
+        self._lru[discord_id] = (time.monotonic() + ttl, player_id)
+        self._lru.move_to_end(discord_id)
+        while len(self._lru) > self.size:
+            self._lru.popitem(last=False)
+
+    def _local(self, discord_id: str):
+        entry = self._lru.get(discord_id)
+        if entry is None:
+            return _MISSING
+        expires_at, player_id = entry
+        if expires_at < time.monotonic():
+            del self._lru[discord_id]
+            return _MISSING
+        self._lru.move_to_end(discord_id)
+        return player_id
+
+    def _forget(self, discord_ids):
+        self._generation += 1
+        for discord_id in discord_ids:
+            self._lru.pop(discord_id, None)
+
+    async def player_id(self, discord_id: str) -> int | None:
+        discord_id = str(discord_id)
+        player_id = self._local(discord_id)
+        if player_id is not _MISSING:
+            return player_id
+
+        generation = self._generation
+        if self.shared_tier:
+            raw = await self.redis.get(self._key(discord_id))
+            if raw is not None:
+                player_id = int(raw) if raw else None
+                if generation == self._generation:
+                    self._remember(discord_id, player_id)
+                return player_id
+
+        async with self.pool.acquire() as conn:
+            player_id = await queries.fetchval(conn, "players.identity", discord_id)
+        # an invalidation arrived meanwhile: answer, but don't cache what may be stale
+        if generation == self._generation:
+            self._remember(discord_id, player_id)
+        if self.shared_tier:
+            await self._put(
+                keys=[self._key(discord_id), self._tombstone(discord_id)],
+                args=[player_id or "", int(self.ttl if player_id else self.negative_ttl)]
+            )
+        return player_id
+
+    async def invalidate(self, *discord_ids: str):
+        discord_ids = [str(d) for d in discord_ids]
+        if not discord_ids:
+            return
+        self._forget(discord_ids)
+        if not self.redis:
+            return
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for discord_id in discord_ids:
+                pipe.set(self._tombstone(discord_id), 1, ex=self.tombstone_ttl)
+            pipe.delete(*(self._key(d) for d in discord_ids))
+            pipe.publish(self.channel, " ".join(discord_ids))
+            await pipe.execute()
+
+    # --- Cross-process invalidation ---
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # the LRU may have missed messages while unsubscribed
+                self._forget(list(self._lru))
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self._forget(message["data"].split())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.error(f"❌ Identity invalidation listener error: {e!r}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def start(self):
+        if self.redis and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+        return self
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
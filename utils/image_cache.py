@@ -0,0 +1,238 @@
+# utils/image_cache.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+log = logging.getLogger(__name__)
+
+
+class ImageCache:
+    """
+    Content-addressed on-disk store for source card images.
+
+    Blobs live under `<root>/blobs/<sha[:2]>/<sha>`; `index.json` maps each
+    (card_id, image_url) pair to its blob and HTTP validators, in LRU order.
+    Fresh entries are served from disk with no network I/O; stale entries are
+    served immediately and revalidated in the background with a conditional GET.
+    Usage:
+    cache = await ImageCache(bot.images, ".cache/cards").load()
+    data1, data2 = await cache.get_many((card1.id, card1.image_url), (card2.id, card2.image_url))
+    """
+
+    def __init__(self, fetcher, root: str, max_bytes: int = 256 * 1024 * 1024,
+                 revalidate_after: float = 86400.0):
+        self.fetcher = fetcher
+        self.root = root
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.total_bytes = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._blob_refs: dict[str, int] = {}
+        self._blob_sizes: dict[str, int] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._save_task: asyncio.Task | None = None
+
+    # --- Paths / keys ---
+    @staticmethod
+    def _key(card_id: int, url: str) -> str:
+        return f"{card_id}:{url}"
+
+    def _blob_path(self, sha: str) -> str:
+        return os.path.join(self.root, "blobs", sha[:2], sha)
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.root, "index.json")
+
+    # --- Index persistence ---
+    async def load(self):
+        def _read():
+            os.makedirs(os.path.join(self.root, "blobs"), exist_ok=True)
+            try:
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (FileNotFoundError, ValueError):
+                return []
+
+        for entry in await asyncio.to_thread(_read):
+            sha = entry["sha"]
+            if not os.path.exists(self._blob_path(sha)):
+                continue
+            self._entries[entry["key"]] = entry
+            self._add_ref(sha, entry["size"])
+
+        log.info(f"🖼️ Image cache loaded: {len(self._entries)} entries, {self.total_bytes:,} bytes")
+        return self
+
+    def _snapshot(self) -> list[dict]:
+        return list(self._entries.values())
+
+    async def save(self):
+        snapshot = self._snapshot()
+
+        def _write():
+            tmp = self._index_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self._index_path)
+
+        await asyncio.to_thread(_write)
+
+    def _mark_dirty(self):
+        # regroupe les écritures de l'index: une seule sauvegarde en attente à la fois
+        if self._save_task is None or self._save_task.done():
+            async def _deferred():
+                await asyncio.sleep(1)
+                await self.save()
+            self._save_task = asyncio.create_task(_deferred())
+
+    # --- Blob bookkeeping ---
+    def _add_ref(self, sha: str, size: int):
+        if sha not in self._blob_refs:
+            self._blob_refs[sha] = 0
+            self._blob_sizes[sha] = size
+            self.total_bytes += size
+        self._blob_refs[sha] += 1
+
+    def _drop_ref(self, sha: str):
+        self._blob_refs[sha] -= 1
+        if self._blob_refs[sha] > 0:
+            return
+        del self._blob_refs[sha]
+        self.total_bytes -= self._blob_sizes.pop(sha)
+        try:
+            os.remove(self._blob_path(sha))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._drop_ref(entry["sha"])
+
+    async def _store(self, key: str, data: bytes, validators: dict):
+        sha = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(sha)
+
+        def _write():
+            if os.path.exists(path):
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+        await asyncio.to_thread(_write)
+
+        old = self._entries.pop(key, None)
+        self._add_ref(sha, len(data))
+        if old:
+            self._drop_ref(old["sha"])
+
+        self._entries[key] = {
+            "key": key,
+            "sha": sha,
+            "size": len(data),
+            "etag": validators.get("etag"),
+            "last_modified": validators.get("last_modified"),
+            "checked_at": time.time()
+        }
+        self._evict()
+        self._mark_dirty()
+
+    async def _read_blob(self, sha: str) -> bytes | None:
+        def _read():
+            try:
+                with open(self._blob_path(sha), "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                return None
+
+        return await asyncio.to_thread(_read)
+
+    # --- Network ---
+    async def _refresh(self, key: str, url: str) -> bytes | None:
+        entry = self._entries.get(key)
+        etag = entry["etag"] if entry else None
+        last_modified = entry["last_modified"] if entry else None
+
+        status, data, validators = await self.fetcher.fetch_conditional(url, etag, last_modified)
+        if status == 304:
+            if key in self._entries:
+                self._entries[key]["checked_at"] = time.time()
+                self._mark_dirty()
+                return None
+            # l'entrée a été évincée pendant la requête: il n'y a plus rien à revalider
+            status, data, validators = await self.fetcher.fetch_conditional(url)
+            if data is None:
+                return None
+
+        await self._store(key, data, validators)
+        return data
+
+    def _refresh_once(self, key: str, url: str) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, url))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return task
+
+    # --- Public API ---
+    async def get(self, card_id: int, url: str) -> bytes | None:
+        """
+        Returns the image bytes for a card, or None if it can't be obtained.
+        """
+        if not url:
+            return None
+        key = self._key(card_id, url)
+        entry = self._entries.get(key)
+
+        if entry:
+            self._entries.move_to_end(key)
+            data = await self._read_blob(entry["sha"])
+            if data is not None:
+                if time.time() - entry["checked_at"] >= self.revalidate_after:
+                    task = self._refresh_once(key, url)
+                    task.add_done_callback(self._log_background_failure)
+                return data
+            # blob supprimé à la main: on oublie l'entrée et on retélécharge
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+                self._drop_ref(entry["sha"])
+
+        try:
+            return await self._refresh_once(key, url)
+        except Exception as e:
+            log.warning(f"❌ Image fetch failed for card {card_id}: {e!r}")
+            return None
+
+    async def get_many(self, *pairs: tuple[int, str]) -> list[bytes | None]:
+        return list(await asyncio.gather(*(self.get(card_id, url) for card_id, url in pairs)))
+
+    async def warm(self, cards) -> tuple[int, int, int]:
+        """
+        Prefetches every (card_id, image_url) pair not already cached.
+        Returns (fetched, already_cached, failed).
+        """
+        cards = [(cid, url) for cid, url in cards if url]
+        todo = [(cid, url) for cid, url in cards if self._key(cid, url) not in self._entries]
+        cached = len(cards) - len(todo)
+
+        results = await asyncio.gather(
+            *(self._refresh_once(self._key(cid, url), url) for cid, url in todo),
+            return_exceptions=True
+        )
+        failed = sum(1 for r in results if isinstance(r, BaseException))
+        await self.save()
+        return len(todo) - failed, cached, failed
+
+    @staticmethod
+    def _log_background_failure(task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            log.warning(f"⚠️ Background image revalidation failed: {task.exception()!r}")
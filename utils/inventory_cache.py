@@ -0,0 +1,47 @@
+# utils/inventory_cache.py
+import json
+
+from models.records import InventoryRecord
+
+
+class InventoryCache:
+    """
+    Per-player `winv` snapshots in Redis, keyed by discord_id.
+    A snapshot holds the player id, bloodcoins, per-form counts and, for
+    collections small enough to load whole, the inventory rows as positional
+    arrays (InventoryRecord field order). Write paths call `invalidate`.
+    Usage:
+    snapshot = await bot.inventory_cache.get(discord_id)
+    await bot.inventory_cache.invalidate(discord_id)
+    """
+
+    def __init__(self, redis, ttl: int = 300, prefix: str = "inv:snap"):
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, discord_id: str) -> str:
+        return f"{self.prefix}:{discord_id}"
+
+    async def get(self, discord_id: str) -> dict | None:
+        raw = await self.redis.get(self._key(discord_id))
+        if not raw:
+            return None
+        snapshot = json.loads(raw)
+        if snapshot["rows"] is not None:
+            snapshot["rows"] = [InventoryRecord._make(r) for r in snapshot["rows"]]
+        return snapshot
+
+    async def put(self, discord_id: str, player_id: int, balance: int,
+                  counts: dict[str, int], rows=None):
+        payload = {
+            "player_id": player_id,
+            "balance": balance,
+            "counts": counts,
+            "rows": [list(r) for r in rows] if rows is not None else None
+        }
+        await self.redis.set(self._key(discord_id), json.dumps(payload, separators=(",", ":")), ex=self.ttl)
+
+    async def invalidate(self, *discord_ids: str):
+        if discord_ids:
+            await self.redis.delete(*(self._key(d) for d in discord_ids))
@@ -0,0 +1,119 @@
+# utils/leaderboard.py
+import asyncio
+import logging
+
+log = logging.getLogger(__name__)
+
+BOARDS = ("coins", "level", "collection")
+
+# level et xp dans un seul score: le niveau d'abord, l'xp départage
+LEVEL_WEIGHT = 10 ** 9
+
+def level_score(level: int, xp: int) -> int:
+    return (level or 1) * LEVEL_WEIGHT + (xp or 0)
+
+def split_level_score(score: float) -> tuple[int, int]:
+    level, xp = divmod(int(score), LEVEL_WEIGHT)
+    return level, xp
+
+
+class Leaderboard:
+    """
+    Redis sorted-set leaderboards keyed `lb:<board>`, members are players.id.
+    Writers update scores as they change players; reads are O(log n).
+    Usage:
+    await bot.leaderboard.update(player_id, coins=balance, level=(level, xp))
+    top = await bot.leaderboard.top("coins", 10)
+    rank = await bot.leaderboard.rank("coins", player_id)
+    """
+
+    def __init__(self, redis, prefix: str = "lb"):
+        self.redis = redis
+        self.prefix = prefix
+        self._task: asyncio.Task | None = None
+
+    def _key(self, board: str) -> str:
+        return f"{self.prefix}:{board}"
+
+    async def update(self, player_id: int, coins: int = None, level: tuple[int, int] = None,
+                     collection: int = None):
+        """Sets absolute scores for whichever boards are given."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if coins is not None:
+                pipe.zadd(self._key("coins"), {player_id: coins})
+            if level is not None:
+                pipe.zadd(self._key("level"), {player_id: level_score(*level)})
+            if collection is not None:
+                pipe.zadd(self._key("collection"), {player_id: collection})
+            await pipe.execute()
+
+    async def incr(self, board: str, player_id: int, delta: int):
+        if delta:
+            await self.redis.zincrby(self._key(board), delta, player_id)
+
+    async def top(self, board: str, n: int = 10) -> list[tuple[int, float]]:
+        rows = await self.redis.zrevrange(self._key(board), 0, n - 1, withscores=True)
+        return [(int(member), score) for member, score in rows]
+
+    async def rank(self, board: str, player_id: int) -> tuple[int, float] | None:
+        """1-based rank and score, or None if the player isn't on the board."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrevrank(self._key(board), player_id)
+            pipe.zscore(self._key(board), player_id)
+            rank, score = await pipe.execute()
+        if rank is None:
+            return None
+        return rank + 1, score
+
+    async def size(self, board: str) -> int:
+        return await self.redis.zcard(self._key(board))
+
+    async def rebuild(self, pool, chunk: int = 1000) -> int:
+        """
+        Recomputes every board from Postgres into temporary keys, then swaps
+        them in with RENAME so readers never see a half-built board.
+        """
+        async with pool.acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT p.id, p.bloodcoins, p.level, p.xp, COALESCE(s.distinct_cards, 0) AS collection
+                FROM players p
+                LEFT JOIN player_collection_stats s ON s.player_id = p.id
+            """)
+
+        tmp = {board: self._key(board) + ":rebuild" for board in BOARDS}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in tmp.values():
+                pipe.delete(key)
+            for start in range(0, len(rows), chunk):
+                batch = rows[start:start + chunk]
+                pipe.zadd(tmp["coins"], {r["id"]: r["bloodcoins"] or 0 for r in batch})
+                pipe.zadd(tmp["level"], {r["id"]: level_score(r["level"], r["xp"]) for r in batch})
+                pipe.zadd(tmp["collection"], {r["id"]: r["collection"] for r in batch})
+            await pipe.execute()
+
+        if rows:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for board, key in tmp.items():
+                    pipe.rename(key, self._key(board))
+                await pipe.execute()
+
+        log.info(f"🏆 Leaderboards rebuilt for {len(rows)} player(s)")
+        return len(rows)
+
+    async def rebuild_if_missing(self, pool):
+        try:
+            if not await self.redis.exists(*(self._key(board) for board in BOARDS)):
+                await self.rebuild(pool)
+        except Exception as e:
+            log.error(f"❌ Leaderboard rebuild failed: {e!r}")
+
+    def start(self, pool):
+        """Rebuilds the boards in the background if Redis lost them."""
+        if self._task is None:
+            self._task = asyncio.create_task(self.rebuild_if_missing(pool))
+        return self
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
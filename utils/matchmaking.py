@@ -0,0 +1,244 @@
+# utils/matchmaking.py
+import asyncio
+import bisect
+import json
+import logging
+import time
+
+log = logging.getLogger(__name__)
+
+# Closest waiting rating on each side of ARGV[2], within ARGV[3]; both players leave the queue atomically.
+# ARGV[4] = 1 when the searching player is itself queued (and must still be, or it was already matched).
+_TAKE_OPPONENT = """
+if ARGV[4] == '1' and not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+    return nil
+end
+local rating = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+local above = redis.call('ZRANGEBYSCORE', KEYS[1], rating, rating + window, 'WITHSCORES', 'LIMIT', 0, 2)
+local below = redis.call('ZREVRANGEBYSCORE', KEYS[1], rating, rating - window, 'WITHSCORES', 'LIMIT', 0, 2)
+local best, best_gap = nil, nil
+for _, list in ipairs({above, below}) do
+    for i = 1, #list, 2 do
+        if list[i] ~= ARGV[1] then
+            local gap = math.abs(tonumber(list[i + 1]) - rating)
+            if best_gap == nil or gap < best_gap then
+                best, best_gap = list[i], gap
+            end
+        end
+    end
+end
+if not best then
+    return nil
+end
+local meta = redis.call('HGET', KEYS[2], best)
+redis.call('ZREM', KEYS[1], best, ARGV[1])
+redis.call('HDEL', KEYS[2], best, ARGV[1])
+return {best, meta}
+"""
+
+
+class LocalMatchQueue:
+    """In-process stand-in for the Redis queue: a sorted list of (rating, player_id)."""
+
+    def __init__(self):
+        self._entries: list[tuple[float, int]] = []
+        self._rating: dict[int, float] = {}
+        self._meta: dict[int, dict] = {}
+
+    async def add(self, player_id: int, rating: float, meta: dict):
+        await self.remove(player_id)
+        bisect.insort(self._entries, (rating, player_id))
+        self._rating[player_id] = rating
+        self._meta[player_id] = meta
+
+    async def remove(self, player_id: int) -> bool:
+        rating = self._rating.pop(player_id, None)
+        if rating is None:
+            return False
+        i = bisect.bisect_left(self._entries, (rating, player_id))
+        del self._entries[i]
+        self._meta.pop(player_id, None)
+        return True
+
+    async def take_opponent(self, player_id: int, rating: float, window: float, queued: bool = False):
+        if queued and player_id not in self._rating:
+            return None
+        i = bisect.bisect_left(self._entries, (rating, float("-inf")))
+        best = None
+        # nearest neighbours on each side, skipping the player itself
+        for step, start in ((-1, i - 1), (1, i)):
+            j = start
+            while 0 <= j < len(self._entries) and self._entries[j][1] == player_id:
+                j += step
+            if 0 <= j < len(self._entries):
+                other_rating, other = self._entries[j]
+                gap = abs(other_rating - rating)
+                if gap <= window and (best is None or gap < best[0]):
+                    best = (gap, other)
+        if best is None:
+            return None
+        meta = self._meta.get(best[1])
+        await self.remove(best[1])
+        await self.remove(player_id)
+        return best[1], meta
+
+    async def waiting(self) -> list[tuple[int, float, dict]]:
+        return [(p, r, self._meta[p]) for r, p in self._entries]
+
+    async def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisMatchQueue:
+    """
+    Waiting players in the sorted set `<prefix>:queue` (score = team power),
+    with their channel/join time in the hash `<prefix>:meta`.
+    """
+
+    def __init__(self, redis, prefix: str = "mm"):
+        self.redis = redis
+        self.queue_key = f"{prefix}:queue"
+        self.meta_key = f"{prefix}:meta"
+        self._take_opponent = redis.register_script(_TAKE_OPPONENT)
+
+    async def add(self, player_id: int, rating: float, meta: dict):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.queue_key, {player_id: rating})
+            pipe.hset(self.meta_key, player_id, json.dumps(meta))
+            await pipe.execute()
+
+    async def remove(self, player_id: int) -> bool:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.queue_key, player_id)
+            pipe.hdel(self.meta_key, player_id)
+            removed, _ = await pipe.execute()
+        return bool(removed)
+
+    async def take_opponent(self, player_id: int, rating: float, window: float, queued: bool = False):
+        found = await self._take_opponent(
+            keys=[self.queue_key, self.meta_key], args=[player_id, rating, window, int(queued)]
+        )
+        if not found:
+            return None
+        opponent, meta = found
+        return int(opponent), json.loads(meta) if meta else None
+
+    async def waiting(self) -> list[tuple[int, float, dict]]:
+        entries = await self.redis.zrange(self.queue_key, 0, -1, withscores=True)
+        if not entries:
+            return []
+        metas = await self.redis.hmget(self.meta_key, [member for member, _ in entries])
+        return [
+            (int(member), score, json.loads(meta) if meta else {})
+            for (member, score), meta in zip(entries, metas)
+        ]
+
+    async def size(self) -> int:
+        return await self.redis.zcard(self.queue_key)
+
+
+class Matchmaker:
+    """
+    PvP queue matched on precomputed team power (team_power table).
+    A new player is matched right away against the closest waiting rating
+    within `base_window`; otherwise they wait, and a worker retries every
+    `tick` seconds with a window that widens by `widen_per_sec` up to
+    `max_window`. Each lookup is a range query on the sorted queue.
+    Match/timeout handlers run as their own tasks, so a slow channel doesn't
+    hold up the rest of the sweep. A queued player whose team changes must
+    `leave` (their queued power is stale).
+    Usage:
+    bot.matchmaker.on_match(handler)      # async handler(a_id, a_meta, b_id, b_meta)
+    bot.matchmaker.on_timeout(handler)    # async handler(player_id, meta)
+    match = await bot.matchmaker.join(player_id, power, {"channel_id": ..., "discord_id": ...})
+    """
+
+    def __init__(self, bot, redis=None, base_window: float = 50, widen_per_sec: float = 5,
+                 max_window: float = 1000, tick: float = 2.0, timeout: float = 300):
+        self.bot = bot
+        self.queue = RedisMatchQueue(redis) if redis else LocalMatchQueue()
+        self.base_window = base_window
+        self.widen_per_sec = widen_per_sec
+        self.max_window = max_window
+        self.tick = tick
+        self.timeout = timeout
+        self._on_match = None
+        self._on_timeout = None
+        self._task: asyncio.Task | None = None
+        self._handlers: set[asyncio.Task] = set()
+
+    def on_match(self, handler):
+        self._on_match = handler
+
+    def on_timeout(self, handler):
+        self._on_timeout = handler
+
+    def window(self, waited: float) -> float:
+        return min(self.base_window + self.widen_per_sec * max(waited, 0), self.max_window)
+
+    async def join(self, player_id: int, rating: float, meta: dict):
+        """Returns (opponent_id, opponent_meta) on an immediate match, else queues the player and returns None."""
+        meta = {**meta, "joined_at": time.time(), "rating": rating}
+        match = await self.queue.take_opponent(player_id, rating, self.base_window)
+        if match:
+            return match
+        await self.queue.add(player_id, rating, meta)
+        return None
+
+    async def leave(self, player_id: int) -> bool:
+        return await self.queue.remove(player_id)
+
+    async def _call(self, description: str, handler, *args):
+        try:
+            await handler(*args)
+        except Exception as e:
+            log.error(f"❌ {description} failed: {e!r}")
+
+    def _dispatch(self, description: str, handler, *args):
+        task = asyncio.create_task(self._call(description, handler, *args))
+        self._handlers.add(task)
+        task.add_done_callback(self._handlers.discard)
+
+    async def _sweep(self):
+        now = time.time()
+        # oldest first: they have the widest window
+        waiting = sorted(await self.queue.waiting(), key=lambda e: e[2].get("joined_at", now))
+        matched = set()
+        for player_id, rating, meta in waiting:
+            if player_id in matched:
+                continue
+            waited = now - meta.get("joined_at", now)
+            if waited >= self.timeout:
+                if await self.queue.remove(player_id) and self._on_timeout:
+                    self._dispatch(f"Timeout handler for {player_id}", self._on_timeout, player_id, meta)
+                continue
+            match = await self.queue.take_opponent(player_id, rating, self.window(waited), queued=True)
+            if not match:
+                continue
+            opponent, opponent_meta = match
+            matched.update((player_id, opponent))
+            if self._on_match:
+                self._dispatch(
+                    f"Match handler for {player_id} vs {opponent}",
+                    self._on_match, player_id, meta, opponent, opponent_meta or {}
+                )
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                await self._sweep()
+            except Exception as e:
+                log.error(f"❌ Matchmaking worker error: {e!r}")
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,82 @@
+# utils/progression.py
+"""
+XP curves for players and cards, shared by every cog and mirrored in
+sql/00_progression.sql.
+
+Players: 100 XP from level 1 to 2, then x1.2 (rounded down) per level, capped
+at PLAYER_MAX_LEVEL. The curve is precomputed once as a cumulative table, so
+resolving any XP grant is a bisect instead of one loop iteration per level.
+Players keep (level, xp into that level) in the database.
+
+Cards: flat CARD_XP_PER_LEVEL XP per level, level = xp // 100 + 1.
+"""
+from bisect import bisect_right
+
+import numpy as np
+
+PLAYER_BASE_XP = 100
+PLAYER_MAX_LEVEL = 90  # stored xp_next stays within a Postgres INT up to here (the SQL curve recurses in BIGINT)
+CARD_XP_PER_LEVEL = 100
+
+
+def _build_curve(max_level: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    xp_next, cumulative = [], []
+    need, total = PLAYER_BASE_XP, 0
+    for _ in range(max_level):
+        xp_next.append(need)
+        cumulative.append(total)
+        total += need
+        need = need * 6 // 5  # x1.2 rounded down, exact in integers like the SQL side
+    return tuple(xp_next), tuple(cumulative)
+
+# index = level - 1
+XP_NEXT, CUMULATIVE_XP = _build_curve(PLAYER_MAX_LEVEL)
+_CUMULATIVE = np.array(CUMULATIVE_XP, dtype=np.int64)
+_XP_NEXT = np.array(XP_NEXT, dtype=np.int64)
+
+
+def _clamp(level) -> int:
+    return min(max(level or 1, 1), PLAYER_MAX_LEVEL)
+
+def xp_to_next(level: int) -> int:
+    """XP needed to go from `level` to `level + 1`."""
+    return XP_NEXT[_clamp(level) - 1]
+
+def total_xp(level: int, xp: int) -> int:
+    """Lifetime XP of a player at (level, xp)."""
+    return CUMULATIVE_XP[_clamp(level) - 1] + (xp or 0)
+
+def level_from_total(total: int) -> tuple[int, int]:
+    """(level, xp into that level) for a lifetime XP amount."""
+    level = max(bisect_right(CUMULATIVE_XP, total), 1)
+    return level, total - CUMULATIVE_XP[level - 1]
+
+def apply_xp(level: int, xp: int, gain: int) -> tuple[int, int, bool]:
+    """Returns (level, xp, leveled_up) after adding `gain` XP."""
+    start = _clamp(level)
+    new_level, new_xp = level_from_total(total_xp(start, xp) + gain)
+    return new_level, new_xp, new_level > start
+
+
+# --- Batch APIs ---
+def apply_xp_many(levels, xps, gains) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized apply_xp over parallel sequences.
+    Returns (levels, xps, leveled_up) as numpy arrays.
+    """
+    levels = np.clip(np.nan_to_num(np.asarray(levels, dtype=np.float64), nan=1), 1, PLAYER_MAX_LEVEL).astype(np.int64)
+    totals = _CUMULATIVE[levels - 1] + np.asarray(xps, dtype=np.int64) + np.asarray(gains, dtype=np.int64)
+    new_levels = np.maximum(np.searchsorted(_CUMULATIVE, totals, side="right"), 1)
+    return new_levels, totals - _CUMULATIVE[new_levels - 1], new_levels > levels
+
+def xp_to_next_many(levels) -> np.ndarray:
+    levels = np.clip(np.asarray(levels, dtype=np.int64), 1, PLAYER_MAX_LEVEL)
+    return _XP_NEXT[levels - 1]
+
+
+# --- Cards ---
+def card_level(xp: int) -> int:
+    return (xp or 0) // CARD_XP_PER_LEVEL + 1
+
+def card_levels(xps) -> np.ndarray:
+    return np.asarray(xps, dtype=np.int64) // CARD_XP_PER_LEVEL + 1
@@ -0,0 +1,73 @@
+# utils/quests.py
+import logging
+from collections import defaultdict
+
+import queries
+
+log = logging.getLogger(__name__)
+
+EVENTS = ("daily", "warp_claim", "summon", "level_up")
+
+
+class QuestEngine:
+    """
+    Routes game events to the quest templates that track them.
+    `quest_templates.event` is indexed in memory at startup (event -> quest ids),
+    so an event nobody tracks costs nothing, and one that several templates
+    track is still one batched write. With a write-behind buffer, progress is
+    queued there and applied at the next flush.
+    Usage:
+    await bot.quests.report(player_id, "summon", 10)
+    """
+
+    def __init__(self, pool, write_behind=None):
+        self.pool = pool
+        self.write_behind = write_behind
+        self.by_event: dict[str, tuple[int, ...]] = {}
+
+    async def load(self):
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT quest_id, event FROM quest_templates WHERE event IS NOT NULL ORDER BY quest_id"
+            )
+        index = defaultdict(list)
+        for r in rows:
+            index[r["event"]].append(r["quest_id"])
+        self.by_event = {event: tuple(ids) for event, ids in index.items()}
+
+        unknown = set(self.by_event) - set(EVENTS)
+        if unknown:
+            log.warning(f"⚠️ Quest templates reference unknown event(s): {', '.join(sorted(unknown))}")
+        log.info(f"📜 Quest index loaded: {len(rows)} template(s) over {len(self.by_event)} event(s)")
+        return self
+
+    def quests_for(self, event: str) -> tuple[int, ...]:
+        return self.by_event.get(event, ())
+
+    async def report(self, player_id: int, event: str, amount: int = 1):
+        await self.report_many([(player_id, event, amount)])
+
+    async def report_many(self, events):
+        """Reports (player_id, event, amount) tuples; all matching progress is written at once."""
+        rows = [
+            (player_id, quest_id, amount)
+            for player_id, event, amount in events if amount
+            for quest_id in self.quests_for(event)
+        ]
+        if not rows:
+            return
+        if self.write_behind:
+            await self.write_behind.add_quest_progress_many(rows)
+        else:
+            await self.apply(rows)
+
+    async def apply(self, rows, conn=None):
+        """Writes (user_id, quest_id, amount) rows to user_quests in one statement."""
+        if not rows:
+            return
+        args = [list(col) for col in zip(*rows)]
+        if conn is not None:
+            await queries.execute(conn, "quests.apply_progress", *args)
+            return
+        async with self.pool.acquire() as conn:
+            await queries.execute(conn, "quests.apply_progress", *args)
@@ -0,0 +1,153 @@
+# utils/reminders.py
+import asyncio
+import logging
+import time
+from collections import defaultdict
+
+log = logging.getLogger(__name__)
+
+# Pops every due member atomically so two bot processes never fire the same reminder
+_POP_DUE = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #items > 0 then
+    redis.call('ZREM', KEYS[1], unpack(items))
+end
+return items
+"""
+
+
+class TimerWheel:
+    """
+    Hashed timer wheel: `slots` buckets of `tick` seconds each.
+    Local stand-in for the Redis sorted set when no Redis is configured.
+    """
+
+    def __init__(self, tick: float = 1.0, slots: int = 1024):
+        self.tick = tick
+        self.slots = slots
+        self._wheel: list[dict[str, float]] = [{} for _ in range(slots)]
+        self._slot_of: dict[str, int] = {}
+        self._cursor = int(time.time() // tick)
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def add(self, member: str, due: float):
+        self.remove(member)
+        # already-due entries go in the current slot so the next pop sees them
+        slot = max(int(due // self.tick), self._cursor) % self.slots
+        self._wheel[slot][member] = due
+        self._slot_of[member] = slot
+
+    def remove(self, member: str):
+        slot = self._slot_of.pop(member, None)
+        if slot is not None:
+            self._wheel[slot].pop(member, None)
+
+    def pop_due(self, now: float, limit: int) -> list[str]:
+        due = []
+        now_tick = int(now // self.tick)
+        # after a long stall, one full turn of the wheel covers every slot
+        start = max(self._cursor, now_tick - self.slots + 1)
+        for t in range(start, now_tick + 1):
+            bucket = self._wheel[t % self.slots]
+            for member, at in list(bucket.items()):
+                if at <= now:
+                    due.append(member)
+                    del bucket[member]
+                    del self._slot_of[member]
+                    if len(due) >= limit:
+                        # slot pas fini: on reprendra ici au prochain tick
+                        self._cursor = t
+                        return due
+        self._cursor = now_tick
+        return due
+
+
+class ReminderScheduler:
+    """
+    Durable reminders fired by a single worker instead of one sleeping task each.
+    Pending reminders live in the Redis sorted set `reminders` (score = due time,
+    member = "<kind>:<channel_id>:<user_id>"), so they survive restarts.
+    Usage:
+    bot.reminders.register("warp", handler)   # async handler(channel_id, user_ids)
+    await bot.reminders.schedule("warp", ctx.channel.id, ctx.author.id, ready_at)
+    """
+
+    def __init__(self, bot, redis=None, key: str = "reminders", tick: float = 1.0, batch: int = 500):
+        self.bot = bot
+        self.redis = redis
+        self.key = key
+        self.tick = tick
+        self.batch = batch
+        self._handlers = {}
+        self._task: asyncio.Task | None = None
+        self._wheel = None if redis else TimerWheel(tick)
+        self._pop_due = redis.register_script(_POP_DUE) if redis else None
+
+    def register(self, kind: str, handler):
+        self._handlers[kind] = handler
+
+    async def schedule(self, kind: str, channel_id: int, user_id: int, due: float):
+        member = f"{kind}:{channel_id}:{user_id}"
+        if self.redis:
+            await self.redis.zadd(self.key, {member: due})
+        else:
+            self._wheel.add(member, due)
+
+    async def cancel(self, kind: str, channel_id: int, user_id: int):
+        member = f"{kind}:{channel_id}:{user_id}"
+        if self.redis:
+            await self.redis.zrem(self.key, member)
+        else:
+            self._wheel.remove(member)
+
+    async def pending(self) -> int:
+        if self.redis:
+            return await self.redis.zcard(self.key)
+        return len(self._wheel)
+
+    async def _take_due(self, now: float) -> list[str]:
+        if self.redis:
+            return await self._pop_due(keys=[self.key], args=[now, self.batch])
+        return self._wheel.pop_due(now, self.batch)
+
+    async def _fire(self, members: list[str]):
+        # regroupe par (kind, channel): un seul message pour tous les joueurs d'un salon
+        groups = defaultdict(list)
+        for member in members:
+            kind, channel_id, user_id = member.split(":")
+            groups[(kind, int(channel_id))].append(int(user_id))
+
+        for (kind, channel_id), user_ids in groups.items():
+            handler = self._handlers.get(kind)
+            if not handler:
+                log.warning(f"⚠️ No reminder handler for '{kind}'")
+                continue
+            try:
+                await handler(channel_id, user_ids)
+            except Exception as e:
+                log.error(f"❌ Reminder '{kind}' failed for channel {channel_id}: {e!r}")
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                members = await self._take_due(time.time())
+                if members:
+                    await self._fire(members)
+                if len(members) >= self.batch:
+                    continue  # encore du retard à rattraper
+            except Exception as e:
+                log.error(f"❌ Reminder worker error: {e!r}")
+            await asyncio.sleep(self.tick)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
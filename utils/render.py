@@ -0,0 +1,113 @@
+# utils/render.py
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PIL import Image
+
+log = logging.getLogger(__name__)
+
+
+# --- Pure Pillow jobs (run inside the worker processes) ---
+def render_fallback_image(max_size=(300, 300), spacing=24) -> bytes:
+    fallback = Image.new("RGBA", (max_size[0]*2 + spacing, max_size[1]), (30, 30, 30, 255))
+    buffer = BytesIO()
+    fallback.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+def render_combined_image(data1: bytes, data2: bytes, max_size=(300, 300), spacing=24) -> bytes:
+    if not data1 or not data2:
+        return render_fallback_image(max_size, spacing)
+    try:
+        img1 = Image.open(BytesIO(data1)).convert("RGBA")
+        img2 = Image.open(BytesIO(data2)).convert("RGBA")
+
+        img1.thumbnail(max_size, Image.LANCZOS)
+        img2.thumbnail(max_size, Image.LANCZOS)
+
+        height = max(img1.height, img2.height)
+        total_width = img1.width + img2.width + spacing
+
+        combined = Image.new("RGBA", (total_width, height), (0, 0, 0, 0))
+        combined.paste(img1, (0, 0))
+        combined.paste(img2, (img1.width + spacing, 0))
+
+        buffer = BytesIO()
+        combined.save(buffer, format="PNG", optimize=True)
+        return buffer.getvalue()
+
+    except Exception as e:
+        print(f"❌ Failed to render combined image: {e}")
+        return render_fallback_image(max_size, spacing)
+
+def _noop():
+    return None
+
+
+class RenderPool:
+    """
+    Process pool for CPU-bound Pillow work, so decoding and PNG encoding never
+    hold the GIL on the event loop thread.
+    Usage:
+    pool = RenderPool(workers=2).start()
+    png = await pool.render(render_combined_image, data1, data2)
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 32, timeout: float = 3.0):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pending = 0
+        self._executor: ProcessPoolExecutor | None = None
+        self._fallback = render_fallback_image()
+
+    def start(self):
+        if self._executor is None:
+            # spawn: ne pas forker un process qui a déjà une boucle asyncio et des threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            # démarre les workers tout de suite plutôt qu'au premier drop
+            for _ in range(self.workers):
+                self._executor.submit(_noop)
+        return self
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _release(self, _fut):
+        self.pending -= 1
+
+    async def render(self, fn, *args) -> bytes:
+        """
+        Runs `fn(*args)` in the pool and returns its PNG bytes.
+        Falls back to a placeholder image when the queue is full, the job
+        times out or the pool is broken.
+        """
+        if self._executor is None or self.pending >= self.max_pending:
+            log.warning(f"⚠️ Render queue full ({self.pending}), using fallback image")
+            return self._fallback
+
+        try:
+            job = asyncio.wrap_future(self._executor.submit(fn, *args))
+        except Exception as e:
+            log.error(f"❌ Render pool unavailable: {e!r}")
+            self.close()
+            self.start()
+            return self._fallback
+
+        self.pending += 1
+        job.add_done_callback(self._release)
+        try:
+            # shield: un job expiré continue de compter dans la file jusqu'à sa fin réelle
+            return await asyncio.wait_for(asyncio.shield(job), self.timeout)
+        except asyncio.TimeoutError:
+            log.warning(f"⚠️ Render job timed out after {self.timeout}s, using fallback image")
+        except Exception as e:
+            log.error(f"❌ Render job failed: {e!r}")
+        return self._fallback
@@ -0,0 +1,49 @@
+# utils/team_cache.py
+import json
+
+import queries
+from models.records import TeamSlotRecord
+
+
+class TeamCache:
+    """
+    Denormalized team rosters in Redis, keyed by players.id.
+    A roster is the player's slots already joined with user_cards and cards,
+    stored as positional arrays (TeamSlotRecord field order). Anything that
+    changes a team or the stats/quantity of an owned card calls `invalidate`.
+    Usage:
+    roster = await bot.team_cache.roster(bot.db, player_id)
+    await bot.team_cache.invalidate(player_id)
+    """
+
+    def __init__(self, redis, ttl: int = 3600, prefix: str = "team"):
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, player_id: int) -> str:
+        return f"{self.prefix}:{player_id}"
+
+    async def get(self, player_id: int) -> list[TeamSlotRecord] | None:
+        raw = await self.redis.get(self._key(player_id))
+        if raw is None:
+            return None
+        return [TeamSlotRecord._make(r) for r in json.loads(raw)]
+
+    async def put(self, player_id: int, roster: list[TeamSlotRecord]):
+        payload = json.dumps([list(r) for r in roster], separators=(",", ":"))
+        await self.redis.set(self._key(player_id), payload, ex=self.ttl)
+
+    async def roster(self, pool, player_id: int) -> list[TeamSlotRecord]:
+        """Cached roster, loaded with one join on a miss (empty teams are cached too)."""
+        roster = await self.get(player_id)
+        if roster is None:
+            async with pool.acquire() as conn:
+                rows = await queries.fetch(conn, "team.roster", player_id)
+            roster = [TeamSlotRecord.from_row(r) for r in rows]
+            await self.put(player_id, roster)
+        return roster
+
+    async def invalidate(self, *player_ids: int):
+        if player_ids:
+            await self.redis.delete(*(self._key(p) for p in player_ids))
@@ -0,0 +1,215 @@
+# utils/write_behind.py
+import asyncio
+import logging
+import time
+import uuid
+
+from redis.exceptions import ResponseError
+
+import queries
+
+log = logging.getLogger(__name__)
+
+MAX_RETRY_DELAY_SEC = 60
+PRUNE_EVERY_SEC = 3600  # applied batch ids are kept a day for replays
+
+# Moves the pending hash to a batch key and registers it as in-flight in one step,
+# so readers always find every not-yet-applied delta in pending + inflight.
+_TAKE_BATCH = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+redis.call('RENAME', KEYS[1], ARGV[1])
+redis.call('SADD', KEYS[2], ARGV[1])
+return ARGV[1]
+"""
+
+
+class WriteBehind:
+    """
+    Write-behind buffer for hot counters on players, user_cards and user_quests.
+
+    Deltas are merged with HINCRBY into the Redis hash `wb:pending`, which is
+    also the journal: nothing lives only in process memory. Every `interval`
+    seconds the hash is renamed to a batch key and applied to Postgres with
+    one multi-row UPDATE per table. The batch id is recorded in
+    `write_behind_batches` in the same transaction, so replaying a batch after
+    a crash is a no-op. Batches left in flight by a failed flush are replayed
+    on the next tick, with a growing delay while Redis/Postgres keep failing.
+
+    Fields: `p:<player_id>:xp`, `p:<player_id>:coins`,
+            `b:<player_id>:<card_id>` (buddy XP), `q:<player_id>:<quest_id>`.
+    Usage:
+    await bot.write_behind.add_player(player_id, xp=10)
+    coins, xp = await bot.write_behind.pending_player(player_id)
+    """
+
+    def __init__(self, pool, redis, interval: float = 2.0, prefix: str = "wb",
+                 team_cache=None, inventory_cache=None):
+        self.pool = pool
+        self.redis = redis
+        self.team_cache = team_cache
+        self.inventory_cache = inventory_cache
+        self.interval = interval
+        self.pending_key = f"{prefix}:pending"
+        self.inflight_key = f"{prefix}:inflight"
+        self.batch_prefix = f"{prefix}:batch"
+        self._take_batch = redis.register_script(_TAKE_BATCH)
+        self._task: asyncio.Task | None = None
+
+    # --- Writers ---
+    async def add_player(self, player_id: int, coins: int = 0, xp: int = 0):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            if coins:
+                pipe.hincrby(self.pending_key, f"p:{player_id}:coins", coins)
+            if xp:
+                pipe.hincrby(self.pending_key, f"p:{player_id}:xp", xp)
+            await pipe.execute()
+
+    async def add_buddy_xp(self, player_id: int, card_id: int, xp: int):
+        await self.redis.hincrby(self.pending_key, f"b:{player_id}:{card_id}", xp)
+
+    async def add_quest_progress_many(self, rows):
+        """Queues (player_id, quest_id, amount) rows."""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for player_id, quest_id, amount in rows:
+                pipe.hincrby(self.pending_key, f"q:{player_id}:{quest_id}", amount)
+            await pipe.execute()
+
+    # --- Readers ---
+    async def _pending_fields(self, *fields: str) -> list[int]:
+        keys = [self.pending_key, *await self.redis.smembers(self.inflight_key)]
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.hmget(key, fields)
+            results = await pipe.execute()
+        totals = [0] * len(fields)
+        for values in results:
+            for i, value in enumerate(values):
+                if value:
+                    totals[i] += int(value)
+        return totals
+
+    async def pending_player(self, player_id: int) -> tuple[int, int]:
+        """(coins, xp) written but not flushed yet; add them to what Postgres returns."""
+        coins, xp = await self._pending_fields(f"p:{player_id}:coins", f"p:{player_id}:xp")
+        return coins, xp
+
+    # --- Flush ---
+    async def flush(self) -> bool:
+        batch_key = f"{self.batch_prefix}:{uuid.uuid4().hex}"
+        taken = await self._take_batch(keys=[self.pending_key, self.inflight_key], args=[batch_key])
+        if not taken:
+            return False
+        await self._apply(batch_key)
+        return True
+
+    async def _apply(self, batch_key: str):
+        data = await self.redis.hgetall(batch_key)
+
+        players: dict[int, list[int]] = {}
+        buddies: list[tuple[int, int, int]] = []
+        quests: list[tuple[int, int, int]] = []
+        for field, value in data.items():
+            kind, player_id, rest = field.split(":", 2)
+            player_id, value = int(player_id), int(value)
+            if not value:
+                continue
+            if kind == "p":
+                deltas = players.setdefault(player_id, [0, 0])
+                deltas[0 if rest == "coins" else 1] += value
+            elif kind == "b":
+                buddies.append((player_id, int(rest), value))
+            elif kind == "q":
+                quests.append((player_id, int(rest), value))
+
+        touched: set[str] = set()  # discord_ids whose winv snapshot is now stale
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                fresh = await queries.fetchval(conn, "write_behind.claim_batch", batch_key)
+                if fresh:
+                    if players:
+                        ids = list(players)
+                        rows = await queries.fetch(
+                            conn, "write_behind.players", ids, [players[i][0] for i in ids], [players[i][1] for i in ids]
+                        )
+                        touched.update(r["discord_id"] for r in rows)
+
+                    if buddies:
+                        rows = await queries.fetch(conn, "write_behind.buddies", *map(list, zip(*buddies)))
+                        touched.update(r["discord_id"] for r in rows)
+
+                    if quests:
+                        await queries.execute(conn, "quests.apply_progress", *map(list, zip(*quests)))
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(batch_key)
+            pipe.srem(self.inflight_key, batch_key)
+            await pipe.execute()
+
+        # buddy XP changed card stats that cached rosters may hold
+        if buddies and self.team_cache:
+            await self.team_cache.invalidate(*{player_id for player_id, _, _ in buddies})
+        # coins and card XP/stats are part of the winv snapshot
+        if touched and self.inventory_cache:
+            await self.inventory_cache.invalidate(*touched)
+
+    async def recover(self) -> bool:
+        """
+        Replays batches left in flight by a crash or a failed flush
+        (already-applied ones are skipped). Returns False if one still failed.
+        """
+        ok = True
+        for batch_key in await self.redis.smembers(self.inflight_key):
+            try:
+                await self._apply(batch_key)
+                log.info(f"♻️ Replayed write-behind batch {batch_key}")
+            except Exception as e:
+                log.error(f"❌ Could not replay write-behind batch {batch_key}: {e!r}")
+                ok = False
+        return ok
+
+    async def prune(self):
+        """Forgets applied batch ids older than a day (one row per flush otherwise piles up)."""
+        async with self.pool.acquire() as conn:
+            await conn.execute("DELETE FROM write_behind_batches WHERE applied_at < now() - interval '1 day'")
+
+    async def _run(self):
+        delay = 0
+        needs_recovery = True  # in-flight batches from a previous process
+        pruned_at = None
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                if needs_recovery:
+                    needs_recovery = not await self.recover()
+                await self.flush()
+                if pruned_at is None or time.monotonic() - pruned_at >= PRUNE_EVERY_SEC:
+                    await self.prune()
+                    pruned_at = time.monotonic()
+            except ResponseError as e:
+                log.error(f"❌ Write-behind Redis error: {e!r}")
+                needs_recovery = True
+            except Exception as e:
+                log.error(f"❌ Write-behind flush failed: {e!r}")
+                needs_recovery = True
+            # back off while replays keep failing, back to the normal tick once they succeed
+            if needs_recovery:
+                delay = min(max(delay * 2, self.interval), MAX_RETRY_DELAY_SEC)
+            else:
+                delay = self.interval
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        """Stops the worker and flushes whatever is still pending."""
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        try:
+            await self.flush()
+        except Exception as e:
+            log.error(f"❌ Final write-behind flush failed: {e!r}")